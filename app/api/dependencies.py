@@ -1,19 +1,17 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional, Union
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.security import verify_token
 from app.db.session import get_db
 from app.db.models.employee import Employee
+from app.services.employee_service import EmployeeService
+from app.services.org_snapshot import Principal
 
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Employee:
-    """Get current authenticated user"""
-    token = credentials.credentials
-    email = verify_token(token)
+def _token_email(credentials: HTTPAuthorizationCredentials) -> str:
+    email = verify_token(credentials.credentials)
     
     if email is None:
         raise HTTPException(
@@ -21,8 +19,9 @@ def get_current_user(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = db.query(Employee).filter(Employee.email == email).first()
+    return email
+
+def _check_user(user):
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,6 +36,20 @@ def get_current_user(
     
     return user
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Employee:
+    """Get current authenticated user"""
+    return _check_user(EmployeeService(db).get_employee_by_email(_token_email(credentials)))
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Union[Principal, Employee]:
+    """Current authenticated user, from the org snapshot when enabled, for endpoints that only check who is calling"""
+    return _check_user(EmployeeService(db).get_principal_by_email(_token_email(credentials)))
+
 def get_current_admin_user(current_user: Employee = Depends(get_current_user)) -> Employee:
     """Ensure current user is an admin"""
     if not current_user.is_admin:
@@ -44,4 +57,32 @@ def get_current_admin_user(current_user: Employee = Depends(get_current_user)) -
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def get_current_admin_principal(current_user: Principal = Depends(get_current_principal)) -> Principal:
+    """get_current_admin_user for endpoints that only check who is calling"""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
+
+def get_if_match_version(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    """Version the client expects, taken from an If-Match ETag"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    
+    tag = if_match.split(",")[0].strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid If-Match header"
+        )
+
+def etag(version: int) -> str:
+    return f'"{version}"'
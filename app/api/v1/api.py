@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import employee, leave, auth
+from app.api.v1.endpoints import employee, leave, auth, report, sync
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(employee.router, prefix="/employees", tags=["employees"])
-api_router.include_router(leave.router, prefix="/leaves", tags=["leaves"])
\ No newline at end of file
+api_router.include_router(leave.router, prefix="/leaves", tags=["leaves"])
+api_router.include_router(report.router, prefix="/reports", tags=["reports"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
@@ -1,11 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.schemas.employee import Employee, EmployeeCreate, EmployeeUpdate
 from app.services.employee_service import EmployeeService
-from app.api.dependencies import get_current_admin_user, get_current_user
+from app.api.dependencies import get_current_admin_principal, get_current_principal, get_current_user, get_if_match_version, etag
 from app.db.models.employee import Employee as EmployeeModel
+from app.services.org_snapshot import Principal
 
 router = APIRouter()
 
@@ -13,7 +14,7 @@ router = APIRouter()
 def create_employee(
     employee: EmployeeCreate,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_principal)
 ):
     """Create a new employee (Admin only)"""
     employee_service = EmployeeService(db)
@@ -24,7 +25,7 @@ def read_employees(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get all employees"""
     employee_service = EmployeeService(db)
@@ -35,11 +36,23 @@ def read_current_employee(current_user: EmployeeModel = Depends(get_current_user
     """Get current user's profile"""
     return current_user
 
+@router.get("/search", response_model=List[Employee])
+def search_employees(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Search employees by name, email or department (prefix and fuzzy)"""
+    employee_service = EmployeeService(db)
+    return employee_service.search_employees(q, limit=limit)
+
 @router.get("/{employee_id}", response_model=Employee)
 def read_employee(
     employee_id: int,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get employee by ID"""
     employee_service = EmployeeService(db)
@@ -57,18 +70,21 @@ def read_employee(
             detail="Not enough permissions"
         )
     
+    response.headers["ETag"] = etag(employee.version)
     return employee
 
 @router.put("/{employee_id}", response_model=Employee)
 def update_employee(
     employee_id: int,
     employee_update: EmployeeUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(get_if_match_version),
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_principal)
 ):
     """Update employee (Admin only)"""
     employee_service = EmployeeService(db)
-    employee = employee_service.update_employee(employee_id, employee_update)
+    employee = employee_service.update_employee(employee_id, employee_update, expected_version)
     
     if not employee:
         raise HTTPException(
@@ -76,13 +92,14 @@ def update_employee(
             detail="Employee not found"
         )
     
+    response.headers["ETag"] = etag(employee.version)
     return employee
 
 @router.delete("/{employee_id}")
 def delete_employee(
     employee_id: int,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_principal)
 ):
     """Delete employee (Admin only)"""
     employee_service = EmployeeService(db)
@@ -100,7 +117,7 @@ def delete_employee(
 def get_employee_balance(
     employee_id: int,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get employee's leave balance"""
     if current_user.id != employee_id and not current_user.is_admin:
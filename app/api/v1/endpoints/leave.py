@@ -1,19 +1,24 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+import anyio
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.schemas.leave import LeaveRequest, LeaveRequestCreate, LeaveRequestAction
+from app.schemas.leave import LeaveCoverage, LeaveRequest, LeaveRequestAction, LeaveRequestCreate, LeaveRequestWithCoverage
+from app.schemas.leave_policy import LeavePolicyEvaluation, LeavePolicyEvaluationRequest
 from app.services.leave_service import LeaveService
-from app.api.dependencies import get_current_admin_user, get_current_user
-from app.db.models.employee import Employee as EmployeeModel
+from app.services.leave_batcher import leave_batcher
+from app.api.dependencies import get_current_principal, get_if_match_version, etag
+from app.core.idempotency import run_idempotent
+from app.services.org_snapshot import Principal
 
 router = APIRouter()
 
 @router.post("/", response_model=LeaveRequest, status_code=status.HTTP_201_CREATED)
 def create_leave_request(
     leave_request: LeaveRequestCreate,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Apply for leave"""
 
@@ -23,8 +28,21 @@ def create_leave_request(
             detail="Can only apply for your own leave"
         )
     
-    leave_service = LeaveService(db)
-    return leave_service.create_leave_request(leave_request)
+    if leave_batcher.running:
+        # Group commit: wait on the event loop for this submission's slot in the next batch
+        handler = lambda: anyio.from_thread.run(leave_batcher.submit, leave_request)
+    else:
+        leave_service = LeaveService(db)
+        handler = lambda: leave_service.create_leave_request(leave_request)
+    
+    return run_idempotent(
+        idempotency_key,
+        scope=f"{current_user.id}:POST /leaves/",
+        payload=leave_request,
+        response_model=LeaveRequest,
+        handler=handler,
+        status_code=status.HTTP_201_CREATED
+    )
 
 @router.get("/", response_model=List[LeaveRequest])
 def read_leave_requests(
@@ -32,7 +50,7 @@ def read_leave_requests(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get leave requests"""
     leave_service = LeaveService(db)
@@ -47,17 +65,45 @@ def read_my_leave_requests(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get current user's leave requests"""
     leave_service = LeaveService(db)
     return leave_service.get_leave_requests(employee_id=current_user.id, skip=skip, limit=limit)
 
+@router.post("/policy/evaluate", response_model=List[LeavePolicyEvaluation])
+def evaluate_leave_requests(
+    evaluation: LeavePolicyEvaluationRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Check hypothetical leave requests against leave policy without creating them"""
+    if not current_user.is_admin and evaluation.employee_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    leave_service = LeaveService(db)
+    return leave_service.evaluate_leave_requests(evaluation.employee_id, evaluation.requests)
+
+@router.get("/pending-approvals", response_model=List[LeaveRequest])
+def read_pending_approvals(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Leave requests waiting on the current user's approval"""
+    leave_service = LeaveService(db)
+    return leave_service.get_pending_approvals(current_user, skip=skip, limit=limit)
+
 @router.get("/{leave_id}", response_model=LeaveRequest)
 def read_leave_request(
     leave_id: int,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: EmployeeModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get leave request by ID"""
     leave_service = LeaveService(db)
@@ -76,26 +122,71 @@ def read_leave_request(
             detail="Not enough permissions"
         )
     
+    response.headers["ETag"] = etag(leave_request.version)
     return leave_request
 
-@router.post("/{leave_id}/approve", response_model=LeaveRequest)
+@router.get("/{leave_id}/coverage", response_model=LeaveCoverage)
+def read_leave_coverage(
+    leave_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Preview department staffing on each weekday of a leave request (its approver or an admin)"""
+    leave_service = LeaveService(db)
+    return leave_service.preview_coverage(leave_id, approver=current_user)
+
+@router.post("/{leave_id}/approve", response_model=LeaveRequestWithCoverage)
 def approve_leave_request(
     leave_id: int,
     action: LeaveRequestAction,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
+    expected_version: Optional[int] = Depends(get_if_match_version),
     db: Session = Depends(get_db),
-    current_admin: EmployeeModel = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Approve leave request (Admin only)"""
+    """Approve the current approval step of a leave request (its approver or an admin), with its department coverage"""
     leave_service = LeaveService(db)
-    return leave_service.approve_leave_request(leave_id, action.admin_comment)
+    
+    def approve():
+        leave_request = leave_service.approve_leave_request(leave_id, action.admin_comment, expected_version, approver=current_user)
+        response.headers["ETag"] = etag(leave_request.version)
+        result = LeaveRequestWithCoverage.model_validate(leave_request)
+        result.coverage = LeaveCoverage.model_validate(leave_service.get_coverage(leave_request))
+        return result
+    
+    return run_idempotent(
+        idempotency_key,
+        scope=f"{current_user.id}:POST /leaves/{leave_id}/approve",
+        payload=action,
+        response_model=LeaveRequestWithCoverage,
+        handler=approve,
+        response=response
+    )
 
 @router.post("/{leave_id}/reject", response_model=LeaveRequest)
 def reject_leave_request(
     leave_id: int,
     action: LeaveRequestAction,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
+    expected_version: Optional[int] = Depends(get_if_match_version),
     db: Session = Depends(get_db),
-    current_admin: EmployeeModel = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Reject leave request (Admin only)"""
+    """Reject the current approval step of a leave request (its approver or an admin)"""
     leave_service = LeaveService(db)
-    return leave_service.reject_leave_request(leave_id, action.admin_comment)
\ No newline at end of file
+    
+    def reject():
+        leave_request = leave_service.reject_leave_request(leave_id, action.admin_comment, expected_version, approver=current_user)
+        response.headers["ETag"] = etag(leave_request.version)
+        return leave_request
+    
+    return run_idempotent(
+        idempotency_key,
+        scope=f"{current_user.id}:POST /leaves/{leave_id}/reject",
+        payload=action,
+        response_model=LeaveRequest,
+        handler=reject,
+        response=response
+    )
\ No newline at end of file
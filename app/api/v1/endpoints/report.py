@@ -0,0 +1,58 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.schemas.report import AbsenteeismRow, BalanceBucket, LeaveUsageRow
+from app.services.report_service import ReportService
+from app.api.dependencies import get_current_admin_principal
+from app.services.org_snapshot import Principal
+
+router = APIRouter()
+
+@router.get("/leave-usage", response_model=List[LeaveUsageRow])
+def leave_usage(
+    year: int = Query(..., ge=1970, le=9999),
+    department: str = None,
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin_principal)
+):
+    """Monthly leave usage by department and leave type (Admin only)"""
+    report_service = ReportService(db)
+    return report_service.leave_usage(year, department)
+
+@router.get("/leave-usage.csv")
+def leave_usage_csv(
+    year: int = Query(..., ge=1970, le=9999),
+    department: str = None,
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin_principal)
+):
+    """Monthly leave usage as CSV (Admin only)"""
+    report_service = ReportService(db)
+    return Response(
+        content=report_service.leave_usage_csv(year, department),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="leave-usage-{year}.csv"'}
+    )
+
+@router.get("/absenteeism", response_model=List[AbsenteeismRow])
+def absenteeism(
+    year: int = Query(..., ge=1970, le=9999),
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin_principal)
+):
+    """Monthly absenteeism rate per department (Admin only)"""
+    report_service = ReportService(db)
+    return report_service.absenteeism(year)
+
+@router.get("/balance-distribution", response_model=List[BalanceBucket])
+def balance_distribution(
+    bucket_size: float = Query(2.0, gt=0),
+    by_department: bool = False,
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin_principal)
+):
+    """Histogram of current leave balances (Admin only)"""
+    report_service = ReportService(db)
+    return report_service.balance_distribution(bucket_size, by_department)
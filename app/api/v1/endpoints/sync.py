@@ -0,0 +1,21 @@
+from typing import Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SyncService
+from app.api.dependencies import get_current_user
+from app.db.models.employee import Employee as EmployeeModel
+
+router = APIRouter()
+
+@router.get("", response_model=SyncResponse)
+def sync(
+    since: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: EmployeeModel = Depends(get_current_user)
+):
+    """Employees and leave requests changed since the token from the previous sync"""
+    sync_service = SyncService(db)
+    employees, leave_requests, token = sync_service.changes(current_user, since)
+    return {"employees": employees, "leave_requests": leave_requests, "token": token}
@@ -0,0 +1,110 @@
+import argparse
+import sys
+
+
+def compress_static(args: argparse.Namespace) -> int:
+    from app.core.static_files import compress_static as run
+
+    written = run(args.directory, min_size=args.min_size)
+    print(f"Wrote {len(written)} compressed assets")
+    return 0
+
+
+def _print_progress(run) -> None:
+    print(f"{run.job} {run.period}: {run.processed} employees updated (through id {run.last_employee_id}, {run.status})")
+
+
+def _session():
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.db.upgrade import upgrade_schema
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    return SessionLocal()
+
+
+def upgrade(args: argparse.Namespace) -> int:
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.db.upgrade import upgrade_schema
+
+    Base.metadata.create_all(bind=engine)
+    added = upgrade_schema(engine)
+    print(f"Added columns: {', '.join(added)}" if added else "Schema is up to date")
+    return 0
+
+
+def accrue(args: argparse.Namespace) -> int:
+    from datetime import date
+    from app.services.accrual_service import AccrualService
+
+    period = args.period or date.today().strftime("%Y-%m")
+    db = _session()
+    try:
+        run = AccrualService(db, chunk_size=args.chunk_size).run_monthly_accrual(period, progress=_print_progress)
+        return 0 if run is not None and run.status == "completed" else 1
+    finally:
+        db.close()
+
+
+def rollover(args: argparse.Namespace) -> int:
+    from datetime import date
+    from app.services.accrual_service import AccrualService
+
+    year = args.year or date.today().year - 1
+    db = _session()
+    try:
+        run = AccrualService(db, chunk_size=args.chunk_size).run_year_end_rollover(year, progress=_print_progress)
+        return 0 if run is not None and run.status == "completed" else 1
+    finally:
+        db.close()
+
+
+def rebuild_rollups(args: argparse.Namespace) -> int:
+    from app.services.report_service import ReportService
+
+    db = _session()
+    try:
+        rows = ReportService(db).rebuild_rollups()
+        print(f"Rebuilt {rows} daily rollup rows")
+        return 0
+    finally:
+        db.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Leave Management System commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compress = subparsers.add_parser("compress-static", help="Pre-compress static assets (.gz/.br)")
+    compress.add_argument("--directory", default="app/static")
+    compress.add_argument("--min-size", type=int, default=256)
+    compress.set_defaults(func=compress_static)
+
+    accrual = subparsers.add_parser("accrue", help="Apply monthly leave accrual (idempotent per period)")
+    accrual.add_argument("--period", help="YYYY-MM, defaults to the current month")
+    accrual.add_argument("--chunk-size", type=int, default=None)
+    accrual.set_defaults(func=accrue)
+
+    year_end = subparsers.add_parser("rollover", help="Apply year-end carry-forward (idempotent per year)")
+    year_end.add_argument("--year", type=int, help="Year being closed, defaults to last year")
+    year_end.add_argument("--chunk-size", type=int, default=None)
+    year_end.set_defaults(func=rollover)
+
+    schema = subparsers.add_parser("upgrade-schema", help="Create missing tables and add missing columns")
+    schema.set_defaults(func=upgrade)
+
+    rollups = subparsers.add_parser("rebuild-rollups", help="Recompute report rollups from decided leave requests")
+    rollups.set_defaults(func=rebuild_rollups)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,50 @@ class Settings(BaseSettings):
     backend_cors_origins: List[str] = []
     default_admin_email: str = "admin@company.com"
     default_admin_password: str = "admin123"
+    idempotency_ttl_seconds: int = 86400
+    idempotency_max_entries: int = 10000
+    rate_limit_enabled: bool = True
+    rate_limit_backend_url: str = ""
+    rate_limit_trusted_proxies: List[str] = []
+    rate_limit_ip_rate: float = 50.0
+    rate_limit_ip_burst: int = 200
+    rate_limit_auth_rate: float = 0.2
+    rate_limit_auth_burst: int = 10
+    rate_limit_read_rate: float = 20.0
+    rate_limit_read_burst: int = 100
+    rate_limit_write_rate: float = 5.0
+    rate_limit_write_burst: int = 20
+    max_concurrent_requests: int = 15
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1000
+    compression_level: int = 6
+    template_bytecode_cache_dir: str = ""
+    leave_policy_file: str = ""
+    accrual_days_per_month: float = 1.5
+    rollover_carry_forward_days: float = 5.0
+    rollover_annual_grant_days: float = 0.0
+    accrual_chunk_size: int = 1000
+    accrual_scheduler_enabled: bool = False
+    accrual_scheduler_interval_seconds: int = 3600
+    search_index_ttl_seconds: int = 60
+    leave_approval_chain: List[str] = ["admin"]
+    hierarchy_cache_ttl_seconds: int = 300
+    sync_overlap_seconds: float = 30.0
+    invalidation_bus_path: str = ""
+    department_min_staffing: int = 0
+    org_snapshot_enabled: bool = False
+    org_snapshot_refresh_seconds: float = 60.0
+    log_level: str = "INFO"
+    log_format: str = "json"
+    trace_exporter: str = ""
+    trace_file: str = "traces.jsonl"
+    trace_sample_rate: float = 0.01
+    leave_batching_enabled: bool = False
+    leave_batch_max_size: int = 100
+    leave_batch_max_wait_ms: float = 5.0
+    warmup_connections: int = 0
+    readiness_timeout_seconds: float = 2.0
+    shutdown_drain_seconds: float = 20.0
 
     class Config:
         env_file = ".env"
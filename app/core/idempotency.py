@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Type
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from .config import settings
+
+
+class IdempotencyEntry:
+    __slots__ = ("fingerprint", "status_code", "body", "headers", "expires_at", "completed")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.status_code = None
+        self.body = None
+        self.headers = {}
+        self.expires_at = expires_at
+        self.completed = False
+
+
+class IdempotencyStore:
+    """In-memory LRU of responses keyed by Idempotency-Key, with TTL eviction"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, IdempotencyEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str) -> Optional[IdempotencyEntry]:
+        """Reserve a key, or return the completed entry that should be replayed"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self._entries[key] = IdempotencyEntry(fingerprint, now + self.ttl_seconds)
+                self._evict(now)
+                return None
+
+            self._entries.move_to_end(key)
+
+        if entry.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+
+        if not entry.completed:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+
+        return entry
+
+    def complete(self, key: str, status_code: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        """Store the response for a reserved key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.status_code = status_code
+            entry.body = body
+            entry.headers = headers or {}
+            entry.completed = True
+
+    def release(self, key: str) -> None:
+        """Drop a reservation so the request can be retried"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.completed:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, now: float) -> None:
+        entries = self._entries
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        while entries:
+            oldest = next(iter(entries.values()))
+            if oldest.expires_at > now:
+                break
+            entries.popitem(last=False)
+
+
+idempotency_store = IdempotencyStore(
+    max_entries=settings.idempotency_max_entries,
+    ttl_seconds=settings.idempotency_ttl_seconds
+)
+
+
+def run_idempotent(
+    key: Optional[str],
+    scope: str,
+    payload: Optional[BaseModel],
+    response_model: Type[BaseModel],
+    handler: Callable[[], Any],
+    status_code: int = status.HTTP_200_OK,
+    response: Optional[Response] = None
+) -> Any:
+    """Run handler once per Idempotency-Key and replay the stored response on retries
+
+    Headers the handler sets on response are stored and replayed with the body.
+    """
+    if not key:
+        return handler()
+
+    if len(key) > 255:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Idempotency-Key must be at most 255 characters"
+        )
+
+    store_key = f"{scope}:{key}"
+    body = payload.model_dump_json() if payload is not None else ""
+    fingerprint = hashlib.sha256(body.encode()).hexdigest()
+
+    entry = idempotency_store.begin(store_key, fingerprint)
+    if entry is not None:
+        return JSONResponse(
+            content=entry.body,
+            status_code=entry.status_code,
+            headers={**entry.headers, "Idempotent-Replayed": "true"}
+        )
+
+    try:
+        result = handler()
+    except Exception:
+        idempotency_store.release(store_key)
+        raise
+
+    content = jsonable_encoder(response_model.model_validate(result))
+    headers = dict(response.headers) if response is not None else {}
+    idempotency_store.complete(store_key, status_code, content, headers)
+    return JSONResponse(content=content, status_code=status_code, headers=headers)
@@ -0,0 +1,66 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from .config import settings
+
+# One generation counter per process-local cache that other workers must drop too
+CHANNELS: Tuple[str, ...] = ("search_index", "org_hierarchy", "leave_policies", "org_snapshot")
+
+_COUNTER = struct.Struct("<Q")
+
+
+class InvalidationBus:
+    """Generation counters in a memory-mapped file shared by every worker
+
+    A cache remembers the generation it was built at and rebuilds once the counter moves,
+    so invalidating in one worker reaches all of them without messages or polling the
+    database. Without a path the counters are private to this process.
+    """
+
+    def __init__(self, path: str = "", channels: Tuple[str, ...] = CHANNELS):
+        self.path = path
+        self.slots: Dict[str, int] = {name: i * _COUNTER.size for i, name in enumerate(channels)}
+        size = _COUNTER.size * len(channels)
+        self._lock = threading.Lock()
+        self._fd = None
+        if path:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+            self._map = mmap.mmap(self._fd, size)
+        else:
+            self._map = mmap.mmap(-1, size)
+
+    def generation(self, channel: str) -> int:
+        return _COUNTER.unpack_from(self._map, self.slots[channel])[0]
+
+    def bump(self, channel: str) -> int:
+        """Advance a channel's generation, invalidating that cache in every worker"""
+        offset = self.slots[channel]
+        with self._lock:
+            if self._fd is not None and fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                generation = _COUNTER.unpack_from(self._map, offset)[0] + 1
+                _COUNTER.pack_into(self._map, offset, generation)
+            finally:
+                if self._fd is not None and fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return generation
+
+    def close(self) -> None:
+        self._map.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+invalidation_bus = InvalidationBus(settings.invalidation_bus_path)
@@ -0,0 +1,216 @@
+import ipaddress
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+from .security import verify_token
+
+
+class RateLimit(NamedTuple):
+    rate: float
+    burst: int
+
+
+class RateLimitBackend(ABC):
+    """Token bucket storage; subclass to share buckets between processes"""
+
+    @abstractmethod
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        """Take cost tokens from a bucket. Returns 0 when allowed, otherwise seconds to wait"""
+
+    def reset(self) -> None:
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process token buckets with a bounded number of tracked keys"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(limit.burst), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(float(limit.burst), bucket[0] + (now - bucket[1]) * limit.rate)
+                bucket[1] = now
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / limit.rate
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Token buckets shared by every worker through Redis (requires the redis package)"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        wait = await self._script(
+            keys=[self.prefix + key],
+            args=[limit.rate, limit.burst, cost, time.time()]
+        )
+        return float(wait)
+
+
+def create_rate_limit_backend(url: str = "") -> RateLimitBackend:
+    if url:
+        return RedisRateLimitBackend(url)
+    return InMemoryRateLimitBackend()
+
+
+rate_limit_backend = create_rate_limit_backend(settings.rate_limit_backend_url)
+
+
+class RateLimitMiddleware:
+    """Token-bucket limits per user and per IP, plus concurrency-based load shedding"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: Optional[RateLimitBackend] = None,
+        ip_limit: RateLimit = RateLimit(settings.rate_limit_ip_rate, settings.rate_limit_ip_burst),
+        auth_limit: RateLimit = RateLimit(settings.rate_limit_auth_rate, settings.rate_limit_auth_burst),
+        read_limit: RateLimit = RateLimit(settings.rate_limit_read_rate, settings.rate_limit_read_burst),
+        write_limit: RateLimit = RateLimit(settings.rate_limit_write_rate, settings.rate_limit_write_burst),
+        max_concurrency: int = settings.max_concurrent_requests,
+        trusted_proxies: Iterable[str] = tuple(settings.rate_limit_trusted_proxies),
+        auth_prefix: str = "/api/v1/auth/",
+        exempt_prefixes: Tuple[str, ...] = ("/static/", "/health", "/livez", "/readyz")
+    ):
+        self.app = app
+        self.backend = backend or rate_limit_backend
+        self.ip_limit = ip_limit
+        self.auth_limit = auth_limit
+        self.read_limit = read_limit
+        self.write_limit = write_limit
+        self.max_concurrency = max_concurrency
+        self.trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies]
+        self.auth_prefix = auth_prefix
+        self.exempt_prefixes = exempt_prefixes
+        self.in_flight = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self._check_limits(scope)
+        if retry_after:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(int(retry_after) + 1)}
+            )
+            await response(scope, receive, send)
+            return
+
+        if self.max_concurrency and self.in_flight >= self.max_concurrency:
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    def _is_trusted(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+
+    def _client_ip(self, scope: Scope) -> str:
+        """Address to rate limit: the peer, or when the peer is a trusted proxy, the nearest
+        X-Forwarded-For hop that is not one; entries further left are client-supplied"""
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        if not self.trusted_proxies or not self._is_trusted(ip):
+            return ip
+
+        forwarded = ",".join(Headers(scope=scope).getlist("x-forwarded-for"))
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not self._is_trusted(hop):
+                return hop
+        return hops[0] if hops else ip
+
+    async def _check_limits(self, scope: Scope) -> float:
+        ip = self._client_ip(scope)
+
+        wait = await self.backend.consume(f"ip:{ip}", self.ip_limit)
+        if wait:
+            return wait
+
+        path = scope["path"]
+        if path.startswith(self.auth_prefix):
+            return await self.backend.consume(f"auth:{ip}", self.auth_limit)
+
+        subject = self._subject(scope)
+        if subject is None:
+            return 0.0
+
+        if scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            return await self.backend.consume(f"read:{subject}", self.read_limit)
+        return await self.backend.consume(f"write:{subject}", self.write_limit)
+
+    @staticmethod
+    def _subject(scope: Scope) -> Optional[str]:
+        authorization = Headers(scope=scope).get("authorization")
+        if not authorization or not authorization.lower().startswith("bearer "):
+            return None
+        return verify_token(authorization[7:])
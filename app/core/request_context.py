@@ -0,0 +1,74 @@
+import logging
+import os
+import re
+import time
+from typing import Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .tracing import Tracer, format_traceparent, parse_traceparent, request_id_var, tracer as default_tracer
+
+logger = logging.getLogger("app.access")
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._\-]{1,128}$")
+
+
+class RequestContextMiddleware:
+    """Assign a request id, continue or start a trace, and write one access log line per request"""
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = None, quiet_prefixes: Tuple[str, ...] = ("/static/", "/health")):
+        self.app = app
+        self.tracer = tracer or default_tracer
+        self.quiet_prefixes = quiet_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+            elif name == b"traceparent":
+                traceparent = value.decode("latin-1")
+        if not request_id or not _REQUEST_ID_RE.match(request_id):
+            request_id = os.urandom(16).hex()
+        trace_id, parent_id, parent_sampled = parse_traceparent(traceparent)
+        sampled = self.tracer.should_sample(parent_sampled)
+
+        token = request_id_var.set(request_id)
+        status_code = 500
+        start = time.perf_counter()
+        path = scope["path"]
+        try:
+            with self.tracer.trace(
+                f"{scope['method']} {path}",
+                trace_id=trace_id,
+                parent_id=parent_id,
+                sampled=sampled,
+                **{"http.method": scope["method"], "http.target": path, "request_id": request_id}
+            ) as root:
+
+                async def send_wrapper(message: Message) -> None:
+                    nonlocal status_code
+                    if message["type"] == "http.response.start":
+                        status_code = message["status"]
+                        response_headers = message.setdefault("headers", [])
+                        response_headers.append((b"x-request-id", request_id.encode("latin-1")))
+                        if root is not None:
+                            root.attributes["http.status_code"] = status_code
+                            response_headers.append(
+                                (b"traceparent", format_traceparent(root.trace_id, root.span_id, True).encode("latin-1"))
+                            )
+                    await send(message)
+
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if not path.startswith(self.quiet_prefixes) or status_code >= 500:
+                logger.info(
+                    "%s %s %s %.1fms", scope["method"], path, status_code, duration_ms,
+                    extra={"status": status_code, "duration_ms": round(duration_ms, 2)}
+                )
+            request_id_var.reset(token)
@@ -3,6 +3,7 @@ from typing import Any, Union, Optional
 from jose import jwt
 from passlib.context import CryptContext
 from .config import settings
+from .tracing import traced
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -17,9 +18,11 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
+@traced
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+@traced
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
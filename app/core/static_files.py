@@ -0,0 +1,85 @@
+import gzip
+import mimetypes
+import os
+from typing import Iterator, List, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+COMPRESSIBLE_EXTENSIONS = (".js", ".css", ".html", ".svg", ".json", ".txt")
+
+# Preferred first
+ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")]
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves `.br`/`.gz` siblings of a file when the client accepts them"""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        accept_encoding = request_headers.get("accept-encoding", "")
+        full_path = str(full_path)
+
+        if full_path.endswith(COMPRESSIBLE_EXTENSIONS):
+            for encoding, suffix in ENCODINGS:
+                if encoding not in accept_encoding:
+                    continue
+                try:
+                    variant_stat = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                if variant_stat.st_mtime < stat_result.st_mtime:
+                    continue
+
+                response = FileResponse(
+                    full_path + suffix,
+                    status_code=status_code,
+                    stat_result=variant_stat,
+                    method=scope["method"],
+                    media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+                )
+                if self.is_not_modified(response.headers, request_headers):
+                    return NotModifiedResponse(response.headers)
+                return response
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if full_path.endswith(COMPRESSIBLE_EXTENSIONS):
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+def _compressible_files(directory: str) -> Iterator[str]:
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def compress_static(directory: str, min_size: int = 256) -> List[str]:
+    """Write `.gz` (and `.br` when brotli is installed) next to each static asset"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    written = []
+    for path in _compressible_files(directory):
+        if os.path.getsize(path) < min_size:
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+
+        variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(data, quality=11)))
+
+        for suffix, compressed in variants:
+            if len(compressed) >= len(data):
+                continue
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+            written.append(path + suffix)
+    return written
@@ -0,0 +1,289 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+current_span_var: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation; only created inside a sampled trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error", "_trace")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], trace: List["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+        self._trace = trace
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def child(self, name: str, attributes: Dict[str, Any]) -> "Span":
+        return Span(name, self.trace_id, self.span_id, self._trace, attributes)
+
+    def finish(self) -> None:
+        self.end_ns = time.time_ns()
+        self._trace.append(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class SpanExporter:
+    """Receives every finished trace on the exporter thread"""
+
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one JSON span per line to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1)
+
+    def export(self, spans: List[Span]) -> None:
+        self._file.write("".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans))
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class OTLPStubExporter(SpanExporter):
+    """Builds OTLP/JSON payloads without sending them; keeps the last ones for inspection"""
+
+    def __init__(self, service_name: str = "leave-management", keep: int = 100):
+        self.service_name = service_name
+        self.keep = keep
+        self.payloads: List[Dict[str, Any]] = []
+
+    def export(self, spans: List[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "app.core.tracing"},
+                    "spans": [
+                        {
+                            "traceId": span.trace_id,
+                            "spanId": span.span_id,
+                            "parentSpanId": span.parent_id or "",
+                            "name": span.name,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": [
+                                {"key": key, "value": {"stringValue": str(value)}}
+                                for key, value in span.attributes.items()
+                            ],
+                            "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+                        }
+                        for span in spans
+                    ]
+                }]
+            }]
+        }
+        self.payloads.append(payload)
+        del self.payloads[:-self.keep]
+        logger.debug("OTLP export of %d spans", len(spans))
+
+
+def create_span_exporter(name: str = "") -> Optional[SpanExporter]:
+    if name == "file":
+        return FileSpanExporter(settings.trace_file)
+    if name == "otlp":
+        return OTLPStubExporter()
+    return None
+
+
+class Tracer:
+    """Head-sampled tracer; unsampled requests pay one context lookup per instrumented call"""
+
+    def __init__(self, sample_rate: float, exporter: Optional[SpanExporter] = None, max_queue: int = 1000):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def should_sample(self, parent_sampled: Optional[bool] = None) -> bool:
+        if self.exporter is None:
+            return False
+        if parent_sampled is not None:
+            return parent_sampled
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    @contextmanager
+    def trace(self, name: str, trace_id: Optional[str] = None, parent_id: Optional[str] = None,
+              sampled: bool = True, **attributes) -> Iterator[Optional[Span]]:
+        """Root span for one unit of work; exports the whole trace when it ends"""
+        if not sampled:
+            yield None
+            return
+
+        spans: List[Span] = []
+        root = Span(name, trace_id or os.urandom(16).hex(), parent_id, spans, attributes)
+        token = current_span_var.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = repr(e)
+            raise
+        finally:
+            current_span_var.reset(token)
+            root.finish()
+            self._submit(spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Child of the current span, or a no-op outside a sampled trace"""
+        parent = current_span_var.get()
+        if parent is None:
+            yield None
+            return
+
+        span = parent.child(name, attributes)
+        token = current_span_var.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            current_span_var.reset(token)
+            span.finish()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export queued traces and stop the exporter thread"""
+        thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+            self._thread = None
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+    def _submit(self, spans: List[Span]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._export_loop, name="span-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("Trace export queue is full, dropping a trace")
+
+    def _export_loop(self) -> None:
+        while True:
+            spans = self._queue.get()
+            if spans is None:
+                return
+            try:
+                self.exporter.export(spans)
+            except Exception:
+                logger.exception("Trace export failed")
+
+
+tracer = Tracer(settings.trace_sample_rate, create_span_exporter(settings.trace_exporter))
+
+
+def traced(obj):
+    """Wrap a function, or every public method of a class, in a span named after it"""
+    if inspect.isclass(obj):
+        for name, member in list(vars(obj).items()):
+            if not name.startswith("_") and inspect.isfunction(member):
+                setattr(obj, name, _wrap(member, f"{obj.__name__}.{name}"))
+        return obj
+    return _wrap(obj, obj.__qualname__)
+
+
+def _wrap(func, name: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if current_span_var.get() is None:
+            return func(*args, **kwargs)
+        with tracer.span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def instrument_engine(engine, max_statement_length: int = 500) -> None:
+    """Record a span for every SQL statement run inside a sampled trace"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        parent = current_span_var.get()
+        if parent is not None:
+            context._trace_span = parent.child("db.query", {"db.statement": statement[:max_statement_length]})
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.attributes["db.rowcount"] = cursor.rowcount
+            span.finish()
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        span = getattr(exception_context.execution_context, "_trace_span", None)
+        if span is not None:
+            span.error = repr(exception_context.original_exception)
+            span.finish()
+
+
+def parse_traceparent(header: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[bool]]:
+    """trace id, parent span id and sampled flag from a W3C traceparent header"""
+    if not header:
+        return None, None, None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None, None, None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None, None, None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None, None, None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+def format_traceparent(trace_id: str, span_id: str, sampled: bool) -> str:
+    return f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}"
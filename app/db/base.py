@@ -1,4 +1,6 @@
 
 from app.db.session import Base
 from app.db.models.employee import Employee
-from app.db.models.leave import LeaveRequest
\ No newline at end of file
+from app.db.models.leave import LeaveApproval, LeaveRequest
+from app.db.models.accrual import AccrualRun
+from app.db.models.report import LeaveDailyRollup
\ No newline at end of file
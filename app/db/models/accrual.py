@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class AccrualRun(Base):
+    __tablename__ = "accrual_runs"
+    __table_args__ = (
+        UniqueConstraint("job", "period", name="uq_accrual_runs_job_period"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job = Column(String(20), nullable=False)
+    period = Column(String(10), nullable=False)
+    status = Column(String(20), nullable=False, default="running")
+    last_employee_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    locked_until = Column(DateTime, nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, Float
+from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, Float, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -9,14 +9,36 @@ class Employee(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, index=True, nullable=False)
-    department = Column(String(100), nullable=False)
+    department = Column(String(100), nullable=False, index=True)
     joining_date = Column(Date, nullable=False)
     leave_balance = Column(Float, default=8.0)  
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
     hashed_password = Column(String(100), nullable=True)
+    manager_id = Column(Integer, ForeignKey("employees.id"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set on insert too, so delta sync sees new rows
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), index=True)
+    version = Column(Integer, nullable=False, default=1)
     
 
-    leave_requests = relationship("LeaveRequest", back_populates="employee")
\ No newline at end of file
+    leave_requests = relationship("LeaveRequest", back_populates="employee")
+    
+    __mapper_args__ = {"version_id_col": version}
+    
+    __table_args__ = tuple(
+        Index(
+            f"ix_employees_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql")
+        for column in ("name", "email", "department")
+    )
+
+
+event.listen(
+    Employee.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
\ No newline at end of file
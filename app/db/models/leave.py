@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -19,6 +19,10 @@ class LeaveType(str, enum.Enum):
 
 class LeaveRequest(Base):
     __tablename__ = "leave_requests"
+    __table_args__ = (
+        Index("ix_leave_requests_employee_start", "employee_id", "start_date"),
+        Index("ix_leave_requests_start_end", "start_date", "end_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -29,8 +33,32 @@ class LeaveRequest(Base):
     reason = Column(Text, nullable=True)
     admin_comment = Column(Text, nullable=True)
     days_requested = Column(Integer, nullable=False)
+    approval_step = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set on insert too, so delta sync sees new rows
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), index=True)
+    version = Column(Integer, nullable=False, default=1)
     
    
-    employee = relationship("Employee", back_populates="leave_requests")
\ No newline at end of file
+    employee = relationship("Employee", back_populates="leave_requests")
+    
+    __mapper_args__ = {"version_id_col": version}
+
+
+class LeaveApproval(Base):
+    """One decision taken on a step of a leave request's approval chain"""
+    __tablename__ = "leave_approvals"
+    __table_args__ = (
+        UniqueConstraint("leave_request_id", "step", name="uq_leave_approvals_request_step"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    leave_request_id = Column(Integer, ForeignKey("leave_requests.id"), nullable=False)
+    step = Column(Integer, nullable=False)
+    role = Column(String(20), nullable=False)
+    approver_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
+    decision = Column(Enum(LeaveStatus), nullable=False)
+    comment = Column(Text, nullable=True)
+    decided_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    leave_request = relationship("LeaveRequest")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Date, Enum
+from app.db.session import Base
+from app.db.models.leave import LeaveType
+
+class LeaveDailyRollup(Base):
+    """Per-day leave counts by department and type, maintained as requests are decided"""
+    __tablename__ = "leave_daily_rollups"
+    
+    day = Column(Date, primary_key=True)
+    department = Column(String(100), primary_key=True)
+    leave_type = Column(Enum(LeaveType), primary_key=True)
+    employees_out = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
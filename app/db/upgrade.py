@@ -0,0 +1,47 @@
+from typing import List, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+# Columns added to tables that create_all will not alter once they exist
+ADDED_COLUMNS: List[Tuple[str, str, str]] = [
+    ("employees", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("leave_requests", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("employees", "manager_id", "INTEGER REFERENCES employees(id)"),
+    ("leave_requests", "approval_step", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+# Indexes added to existing tables, as (name, table, columns)
+ADDED_INDEXES: List[Tuple[str, str, str]] = [
+    ("ix_employees_manager_id", "employees", "manager_id"),
+    ("ix_employees_updated_at", "employees", "updated_at"),
+    ("ix_leave_requests_updated_at", "leave_requests", "updated_at"),
+    ("ix_employees_department", "employees", "department"),
+    ("ix_leave_requests_start_end", "leave_requests", "start_date, end_date"),
+]
+
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """Add any missing columns and their indexes to existing tables; returns what was added"""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    added = []
+    with engine.begin() as connection:
+        for table, column, ddl in ADDED_COLUMNS:
+            if table not in tables:
+                continue
+            if column in {existing["name"] for existing in inspector.get_columns(table)}:
+                continue
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            added.append(f"{table}.{column}")
+        for name, table, columns in ADDED_INDEXES:
+            if table not in tables:
+                continue
+            current = inspect(connection)
+            existing_columns = {existing["name"] for existing in current.get_columns(table)}
+            if any(column.strip() not in existing_columns for column in columns.split(",")):
+                continue
+            if name in {index["name"] for index in current.get_indexes(table)}:
+                continue
+            connection.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+            added.append(name)
+    return added
@@ -1,28 +1,85 @@
 from fastapi import FastAPI, Request, Depends, HTTPException, status
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from jinja2 import FileSystemBytecodeCache
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
+from datetime import date
 
 from app.core.config import settings
+from app.core.lifecycle import DrainMiddleware, check_database, lifecycle, warm_up_connections, warm_up_templates
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.request_context import RequestContextMiddleware
+from app.core.tracing import instrument_engine, tracer
+from app.core.rate_limit import RateLimitMiddleware, rate_limit_backend
+from app.core.static_files import PrecompressedStaticFiles
+from app.core.scheduler import PeriodicJob
 from app.api.v1.api import api_router
-from app.db.session import get_db, engine
+from app.db.session import get_db, engine, SessionLocal
 from app.db.base import Base
+from app.db.upgrade import upgrade_schema
 from app.db.models.employee import Employee
 from app.core.security import get_password_hash, create_access_token
 from app.services.employee_service import EmployeeService
 from app.services.leave_service import LeaveService
+from app.services.accrual_service import AccrualService
+from app.services.leave_batcher import leave_batcher
 
 
+logger = logging.getLogger("app")
+instrument_engine(engine)
+
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
+
+def run_accrual_jobs():
+    db = SessionLocal()
+    try:
+        AccrualService(db).run_due_jobs()
+    finally:
+        db.close()
+
+def warm_up():
+    """Pre-open pooled connections, populate the compiled statement cache and compile templates"""
+    try:
+        opened = warm_up_connections(engine, settings.warmup_connections)
+        lifecycle.mark_warm("connections")
+        logger.info("Opened %d pooled connections", opened)
+    except Exception:
+        logger.exception("Connection warm-up failed")
+    
+    db = SessionLocal()
+    try:
+        employee_service = EmployeeService(db)
+        leave_service = LeaveService(db)
+        employee_service.get_employee(0)
+        employee_service.get_employee_by_email("")
+        leave_service.get_leave_request(0)
+        leave_service.get_leave_requests(employee_id=0, limit=1)
+        leave_service._check_overlapping_leaves(0, date.today(), date.today())
+        lifecycle.mark_warm("queries")
+    except Exception:
+        logger.exception("Query warm-up failed")
+    finally:
+        db.close()
+    
+    try:
+        compiled = warm_up_templates(templates.env)
+        lifecycle.mark_warm("templates")
+        logger.info("Compiled %d templates", compiled)
+    except Exception:
+        logger.exception("Template warm-up failed")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    
-    print("Application starting up...")
+    setup_logging()
+    lifecycle.reset()
+    logger.info("Application starting up")
     
     db = next(get_db())
     try:
@@ -40,17 +97,35 @@ async def lifespan(app: FastAPI):
             from app.schemas.employee import EmployeeCreate
             admin_create = EmployeeCreate(**admin_data)
             employee_service.create_employee(admin_create)
-            print(f"Default admin created: {settings.default_admin_email}")
+            logger.info("Default admin created: %s", settings.default_admin_email)
         else:
-            print("Default admin already exists")
-    except Exception as e:
-        print(f"Error creating default admin: {e}")
+            logger.info("Default admin already exists")
+    except Exception:
+        logger.exception("Error creating default admin")
     finally:
         db.close()
     
+    accrual_job = None
+    if settings.accrual_scheduler_enabled:
+        accrual_job = PeriodicJob("leave-accrual", run_accrual_jobs, settings.accrual_scheduler_interval_seconds)
+        accrual_job.start()
+    
+    if settings.leave_batching_enabled:
+        leave_batcher.start()
+    
+    await asyncio.to_thread(warm_up)
+    
     yield
     
-    print("Application shutting down...")
+    logger.info("Application shutting down, draining %d in-flight requests", lifecycle.in_flight)
+    await lifecycle.drain(settings.shutdown_drain_seconds)
+    await leave_batcher.stop()
+    if accrual_job:
+        await accrual_job.stop()
+    engine.dispose()
+    logger.info("Shutdown complete")
+    tracer.shutdown()
+    shutdown_logging()
 
 app = FastAPI(
     title="Leave Management System",
@@ -60,6 +135,16 @@ app = FastAPI(
 )
 
 
+if settings.compression_enabled:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        compresslevel=settings.compression_level
+    )
+
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware, backend=rate_limit_backend)
+
 if settings.backend_cors_origins:
     app.add_middleware(
         CORSMiddleware,
@@ -67,14 +152,22 @@ if settings.backend_cors_origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Request-ID"],
     )
 
+app.add_middleware(DrainMiddleware, state=lifecycle)
+app.add_middleware(RequestContextMiddleware, tracer=tracer, quiet_prefixes=("/static/", "/health", "/livez", "/readyz"))
+
 
 app.include_router(api_router, prefix="/api/v1")
 
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
-templates = Jinja2Templates(directory="app/templates")
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
+templates = Jinja2Templates(
+    directory="app/templates",
+    auto_reload=not settings.is_production,
+    bytecode_cache=FileSystemBytecodeCache(settings.template_bytecode_cache_dir or None)
+)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -102,11 +195,52 @@ async def leaves_page(request: Request):
     """Leaves page"""
     return templates.TemplateResponse("leaves.html", {"request": request})
 
+@app.get("/sw.js", include_in_schema=False)
+async def service_worker():
+    """Service worker, served from the root so its scope covers every page"""
+    return FileResponse(
+        "app/static/js/sw.js",
+        media_type="application/javascript",
+        headers={"Cache-Control": "no-cache", "Service-Worker-Allowed": "/"}
+    )
+
+async def database_reachable() -> bool:
+    try:
+        await asyncio.wait_for(asyncio.to_thread(check_database, engine), settings.readiness_timeout_seconds)
+        return True
+    except Exception:
+        logger.warning("Database check failed", exc_info=True)
+        return False
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    if not await database_reachable():
+        return JSONResponse(
+            {"status": "unhealthy", "message": "Database is unreachable"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
     return {"status": "healthy", "message": "Leave Management System is running"}
 
+@app.get("/livez")
+async def liveness_probe():
+    """Liveness probe: the process is up and its event loop is responsive"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness_probe():
+    """Readiness probe: warmed up, not draining and able to reach the database"""
+    checks = {
+        "database": await database_reachable(),
+        "draining": lifecycle.draining,
+        **{f"warm_{step}": done for step, done in lifecycle.warmed.items()}
+    }
+    ready = checks["database"] and not lifecycle.draining and lifecycle.warm
+    return JSONResponse(
+        {"status": "ready" if ready else "not ready", "checks": checks},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
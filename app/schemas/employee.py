@@ -12,6 +12,7 @@ class EmployeeBase(BaseModel):
 class EmployeeCreate(EmployeeBase):
     password: Optional[str] = None
     is_admin: Optional[bool] = False
+    manager_id: Optional[int] = None
 
 class EmployeeUpdate(BaseModel):
     name: Optional[str] = None
@@ -20,12 +21,15 @@ class EmployeeUpdate(BaseModel):
     leave_balance: Optional[float] = None
     is_active: Optional[bool] = None
     is_admin: Optional[bool] = None
+    manager_id: Optional[int] = None
 
 class Employee(EmployeeBase):
     id: int
     leave_balance: float
     is_active: bool
     is_admin: bool
+    manager_id: Optional[int] = None
+    version: int = 1
     
     class Config:
         from_attributes = True
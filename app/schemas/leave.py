@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, validator
 from app.db.models.leave import LeaveType, LeaveStatus
 
@@ -34,10 +34,28 @@ class LeaveRequest(LeaveRequestBase):
     status: LeaveStatus
     days_requested: int
     admin_comment: Optional[str] = None
+    approval_step: int = 0
+    version: int = 1
     
     class Config:
         from_attributes = True
 
+class DayCoverage(BaseModel):
+    day: date
+    headcount: int
+    approved_out: int
+    pending_out: int
+    available: int
+
+class LeaveCoverage(BaseModel):
+    leave_request_id: int
+    department: str
+    minimum_staffing: int
+    days: List[DayCoverage]
+
+class LeaveRequestWithCoverage(LeaveRequest):
+    coverage: Optional[LeaveCoverage] = None
+
 class LeaveRequestWithEmployee(LeaveRequest):
     employee: "Employee" = None
 
@@ -0,0 +1,41 @@
+from datetime import date
+from typing import Dict, List, Optional
+from pydantic import BaseModel, validator
+from app.db.models.leave import LeaveType
+from app.schemas.leave import LeaveRequestBase
+
+
+class BlackoutPeriod(BaseModel):
+    start_date: date
+    end_date: date
+
+    @validator('end_date')
+    def end_date_not_before_start_date(cls, v, values):
+        if 'start_date' in values and v < values['start_date']:
+            raise ValueError('Blackout end date must not be before start date')
+        return v
+
+class LeaveTypePolicy(BaseModel):
+    uses_balance: bool = True
+    annual_quota: Optional[float] = None
+    probation_days: int = 0
+    max_consecutive_days: Optional[int] = None
+    blackout_periods: List[BlackoutPeriod] = []
+    carry_forward_max: Optional[float] = None
+
+class LeavePolicyConfig(BaseModel):
+    default: LeaveTypePolicy = LeaveTypePolicy()
+    types: Dict[LeaveType, LeaveTypePolicy] = {}
+
+class LeavePolicyEvaluationRequest(BaseModel):
+    employee_id: int
+    requests: List[LeaveRequestBase]
+
+class LeavePolicyEvaluation(BaseModel):
+    index: int
+    start_date: date
+    end_date: date
+    leave_type: LeaveType
+    days_requested: int
+    allowed: bool
+    violations: List[str] = []
@@ -0,0 +1,26 @@
+from typing import Optional
+from pydantic import BaseModel
+from app.db.models.leave import LeaveType
+
+class LeaveUsageRow(BaseModel):
+    year: int
+    month: int
+    department: str
+    leave_type: LeaveType
+    days_out: int
+    days_rejected: int
+
+class AbsenteeismRow(BaseModel):
+    year: int
+    month: int
+    department: str
+    headcount: int
+    working_days: int
+    days_out: int
+    absenteeism_rate: float
+
+class BalanceBucket(BaseModel):
+    department: Optional[str] = None
+    lower: float
+    upper: float
+    employees: int
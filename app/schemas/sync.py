@@ -0,0 +1,9 @@
+from typing import List
+from pydantic import BaseModel
+from app.schemas.employee import Employee
+from app.schemas.leave import LeaveRequest
+
+class SyncResponse(BaseModel):
+    employees: List[Employee]
+    leave_requests: List[LeaveRequest]
+    token: str
@@ -0,0 +1,191 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional, Tuple
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.accrual import AccrualRun
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveType
+from app.services.leave_policy import get_leave_policies
+
+logger = logging.getLogger(__name__)
+
+ACCRUAL_JOB = "accrual"
+ROLLOVER_JOB = "rollover"
+
+ProgressCallback = Callable[[AccrualRun], None]
+
+
+class AccrualService:
+    """Monthly accrual and year-end rollover, applied in keyset chunks with one UPDATE per chunk"""
+
+    def __init__(self, db: Session, chunk_size: int = None, lease_seconds: int = 300):
+        self.db = db
+        self.chunk_size = chunk_size or settings.accrual_chunk_size
+        self.lease = timedelta(seconds=lease_seconds)
+
+    def run_monthly_accrual(self, period: str, progress: ProgressCallback = None) -> Optional[AccrualRun]:
+        """Credit the monthly accrual for a YYYY-MM period to active employees who had joined by its end"""
+        year, month = (int(part) for part in period.split("-"))
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+
+        new_balance = func.coalesce(Employee.leave_balance, 0) + settings.accrual_days_per_month
+        return self._run(
+            ACCRUAL_JOB,
+            f"{year:04d}-{month:02d}",
+            new_balance,
+            Employee.joining_date < next_month,
+            progress
+        )
+
+    def run_year_end_rollover(self, year: int, progress: ProgressCallback = None) -> Optional[AccrualRun]:
+        """Cap carried-forward balances at the end of a year and add the annual grant
+
+        Every leave type draws on the one leave_balance, so there is a single cap: the VACATION
+        policy's carry_forward_max, or ROLLOVER_CARRY_FORWARD_DAYS when that policy sets none.
+        """
+        cap = get_leave_policies()[LeaveType.VACATION].carry_forward_max
+        if cap is None:
+            cap = settings.rollover_carry_forward_days
+
+        balance = func.coalesce(Employee.leave_balance, 0)
+        new_balance = case((balance > cap, cap), else_=balance) + settings.rollover_annual_grant_days
+        return self._run(
+            ROLLOVER_JOB,
+            f"{year:04d}",
+            new_balance,
+            Employee.joining_date <= date(year, 12, 31),
+            progress
+        )
+
+    def run_due_jobs(self, today: date = None) -> None:
+        """Catch up on whatever is due by today; safe to call repeatedly
+
+        Accrual is paid in arrears, for the last completed month. The previous year's rollover
+        is retried on every call until it has completed, so a scheduler that was down in January
+        still applies it; in January it waits until December has been credited.
+        """
+        today = today or date.today()
+        last_month = today.replace(day=1) - timedelta(days=1)
+        period = f"{last_month.year:04d}-{last_month.month:02d}"
+        if last_month.year < today.year:
+            december = self.run_monthly_accrual(period)
+            if december is None or december.status != "completed":
+                return
+        self.run_year_end_rollover(today.year - 1)
+        self.run_monthly_accrual(period)
+
+    def _claim(self, job: str, period: str) -> Optional[Tuple[AccrualRun, datetime]]:
+        """Get or create the run record and take its lease, returned with the lease expiry that
+        identifies it; None if finished or owned by another worker"""
+        run = self.db.query(AccrualRun).filter(AccrualRun.job == job, AccrualRun.period == period).first()
+        if run is None:
+            try:
+                run = AccrualRun(job=job, period=period, status="running", last_employee_id=0, processed=0)
+                self.db.add(run)
+                self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+                run = self.db.query(AccrualRun).filter(AccrualRun.job == job, AccrualRun.period == period).first()
+
+        if run.status == "completed":
+            return None
+
+        now = datetime.utcnow()
+        lease_until = now + self.lease
+        claimed = self.db.execute(
+            update(AccrualRun)
+            .where(
+                AccrualRun.id == run.id,
+                AccrualRun.status != "completed",
+                (AccrualRun.locked_until.is_(None)) | (AccrualRun.locked_until < now)
+            )
+            .values(locked_until=lease_until)
+        ).rowcount
+        self.db.commit()
+        if not claimed:
+            return None
+
+        self.db.refresh(run)
+        return run, lease_until
+
+    def _renew(self, run: AccrualRun, lease_until: datetime, **values) -> Optional[datetime]:
+        """Checkpoint the run and extend its lease, but only while this worker still holds it
+
+        Returns the new lease expiry, or None when the lease lapsed and another worker took the
+        run over; the caller must then roll back instead of committing its chunk.
+        """
+        renewed_until = datetime.utcnow() + self.lease
+        held = self.db.execute(
+            update(AccrualRun)
+            .where(AccrualRun.id == run.id, AccrualRun.locked_until == lease_until)
+            .values(locked_until=renewed_until, **values)
+        ).rowcount
+        return renewed_until if held else None
+
+    def _run(self, job: str, period: str, new_balance, eligible, progress: Optional[ProgressCallback]) -> Optional[AccrualRun]:
+        claimed = self._claim(job, period)
+        if claimed is None:
+            return self.db.query(AccrualRun).filter(AccrualRun.job == job, AccrualRun.period == period).first()
+        run, lease_until = claimed
+        last_employee_id, processed = run.last_employee_id, run.processed
+
+        while True:
+            upper = self._chunk_upper_bound(last_employee_id)
+            if upper is None:
+                break
+
+            updated = self.db.execute(
+                update(Employee)
+                .where(
+                    Employee.id > last_employee_id,
+                    Employee.id <= upper,
+                    Employee.is_active == True,
+                    eligible
+                )
+                .values(leave_balance=new_balance, version=Employee.version + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+            # The checkpoint commits with the chunk, so a resumed run never applies a chunk twice
+            lease_until = self._renew(run, lease_until, last_employee_id=upper, processed=processed + updated)
+            if lease_until is None:
+                self.db.rollback()
+                logger.warning("Lost the lease on %s run %s, leaving it to the worker that took it over", job, period)
+                self.db.refresh(run)
+                return run
+            self.db.commit()
+            last_employee_id, processed = upper, processed + updated
+
+            if progress:
+                self.db.refresh(run)
+                progress(run)
+
+        completed = self.db.execute(
+            update(AccrualRun)
+            .where(AccrualRun.id == run.id, AccrualRun.locked_until == lease_until)
+            .values(status="completed", completed_at=datetime.utcnow(), locked_until=None)
+        ).rowcount
+        self.db.commit()
+        self.db.refresh(run)
+        if not completed:
+            logger.warning("Lost the lease on %s run %s before completing it", job, period)
+            return run
+        if progress:
+            progress(run)
+        return run
+
+    def _chunk_upper_bound(self, last_id: int) -> Optional[int]:
+        """Highest employee id in the next chunk after last_id"""
+        upper = self.db.execute(
+            select(Employee.id)
+            .where(Employee.id > last_id)
+            .order_by(Employee.id)
+            .offset(self.chunk_size - 1)
+            .limit(1)
+        ).scalar()
+        if upper is None:
+            upper = self.db.execute(select(func.max(Employee.id)).where(Employee.id > last_id)).scalar()
+        return upper
@@ -0,0 +1,25 @@
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+
+def check_version(current_version: int, expected_version: Optional[int], detail: str) -> None:
+    """Reject the request if the client's If-Match version is out of date"""
+    if expected_version is not None and current_version != expected_version:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=detail
+        )
+
+
+def commit_or_conflict(db: Session, detail: str) -> None:
+    """Commit, turning a failed versioned UPDATE into a 409"""
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail
+        )
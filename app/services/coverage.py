@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+from typing import Iterable, List, Tuple
+
+ONE_DAY = timedelta(days=1)
+
+
+def daily_absences(
+    intervals: Iterable[Tuple[date, date, bool]],
+    start_date: date,
+    end_date: date
+) -> List[Tuple[date, int, int]]:
+    """People away on each weekday of a window, as (day, approved, pending)
+
+    A sweep-line over the intervals' start and end events, clipped to the window, so the
+    cost is O(n log n + days) however long the individual leaves are.
+    """
+    events: List[Tuple[date, int, int]] = []
+    for leave_start, leave_end, approved in intervals:
+        first = max(leave_start, start_date)
+        last = min(leave_end, end_date)
+        if first > last:
+            continue
+        events.append((first, 1 if approved else 0, 0 if approved else 1))
+        events.append((last + ONE_DAY, -1 if approved else 0, 0 if approved else -1))
+    events.sort()
+
+    days = []
+    approved_out = pending_out = 0
+    position = 0
+    day = start_date
+    while day <= end_date:
+        while position < len(events) and events[position][0] <= day:
+            approved_out += events[position][1]
+            pending_out += events[position][2]
+            position += 1
+        if day.weekday() < 5:
+            days.append((day, approved_out, pending_out))
+        day += ONE_DAY
+    return days
@@ -0,0 +1,140 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus, invalidation_bus
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+FUZZY_THRESHOLD = 0.3
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EmployeeSearchIndex:
+    """Sorted token array for prefix lookups plus a trigram map for fuzzy matches"""
+
+    def __init__(self, rows: Iterable[Tuple[int, str, str, str]]):
+        postings: Dict[str, set] = defaultdict(set)
+        self.names: Dict[int, str] = {}
+        for employee_id, name, email, department in rows:
+            self.names[employee_id] = name.lower()
+            for token in tokenize(name) + tokenize(department) + tokenize(email):
+                postings[token].add(employee_id)
+            postings[email.lower()].add(employee_id)
+
+        self.tokens: List[str] = sorted(postings)
+        self.postings: List[Tuple[int, ...]] = [tuple(postings[token]) for token in self.tokens]
+
+        self.trigram_map: Dict[str, List[int]] = defaultdict(list)
+        self.token_trigrams: List[set] = []
+        for position, token in enumerate(self.tokens):
+            grams = trigrams(token)
+            self.token_trigrams.append(grams)
+            for gram in grams:
+                self.trigram_map[gram].append(position)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+
+        start = bisect_left(self.tokens, term)
+        for position in range(start, len(self.tokens)):
+            token = self.tokens[position]
+            if not token.startswith(term):
+                break
+            score = EXACT_SCORE if token == term else PREFIX_SCORE
+            for employee_id in self.postings[position]:
+                if scores.get(employee_id, 0) < score:
+                    scores[employee_id] = score
+
+        if len(term) >= 3:
+            term_grams = trigrams(term)
+            shared: Dict[int, int] = defaultdict(int)
+            for gram in term_grams:
+                for position in self.trigram_map.get(gram, ()):
+                    shared[position] += 1
+            for position, common in shared.items():
+                similarity = common / len(term_grams | self.token_trigrams[position])
+                if similarity < FUZZY_THRESHOLD:
+                    continue
+                for employee_id in self.postings[position]:
+                    if scores.get(employee_id, 0) < similarity:
+                        scores[employee_id] = similarity
+
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """Employee ids matching every query term, best first"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        totals: Optional[Dict[int, float]] = None
+        for term in terms:
+            scores = self._term_scores(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {employee_id: total + scores[employee_id] for employee_id, total in totals.items() if employee_id in scores}
+            if not totals:
+                return []
+
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], self.names[item[0]], item[0]))
+        return [employee_id for employee_id, _ in ranked[:limit]]
+
+
+class SearchIndexCache:
+    """Process-wide index, rebuilt lazily after invalidation (in any worker) or once it is older than the TTL"""
+
+    def __init__(self, ttl_seconds: float, bus: InvalidationBus = invalidation_bus, channel: str = "search_index"):
+        self.ttl_seconds = ttl_seconds
+        self.bus = bus
+        self.channel = channel
+        self._index: Optional[EmployeeSearchIndex] = None
+        self._built_at = 0.0
+        self._generation = -1
+        self._lock = threading.Lock()
+
+    def _fresh(self, index) -> bool:
+        return (
+            index is not None
+            and time.monotonic() - self._built_at < self.ttl_seconds
+            and self._generation == self.bus.generation(self.channel)
+        )
+
+    def get(self, load_rows) -> EmployeeSearchIndex:
+        index = self._index
+        if self._fresh(index):
+            return index
+
+        with self._lock:
+            if not self._fresh(self._index):
+                # Read the generation first so an invalidation during the load is not lost
+                generation = self.bus.generation(self.channel)
+                self._index = EmployeeSearchIndex(load_rows())
+                self._built_at = time.monotonic()
+                self._generation = generation
+            return self._index
+
+    def invalidate(self) -> None:
+        self._index = None
+        self.bus.bump(self.channel)
+
+
+search_index_cache = SearchIndexCache(settings.search_index_ttl_seconds)
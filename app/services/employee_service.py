@@ -1,11 +1,47 @@
-from typing import List, Optional
+from datetime import timedelta
+from typing import List, Optional, Union
+from sqlalchemy import bindparam, case, func, or_, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.db.models.employee import Employee
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate
+from app.core.config import settings
 from app.core.security import get_password_hash
+from app.services.employee_search import search_index_cache
+from app.services.org_hierarchy import OrgHierarchy, hierarchy_cache
+from app.services.org_snapshot import OrgSnapshot, Principal, org_snapshot_cache
+from app.services.concurrency import check_version, commit_or_conflict
+from app.core.tracing import traced
 
+# Built once so every call reuses the same statement and its compiled form
+EMPLOYEE_BY_EMAIL = select(Employee).where(Employee.email == bindparam("email")).limit(1)
+EMPLOYEES_BY_IDS = select(Employee).where(Employee.id.in_(bindparam("ids", expanding=True)))
+EMPLOYEES_PAGE = select(Employee).offset(bindparam("skip")).limit(bindparam("limit"))
+ACTIVE_EMPLOYEES_PAGE = (
+    select(Employee).where(Employee.is_active == True).offset(bindparam("skip")).limit(bindparam("limit"))
+)
+SEARCH_INDEX_ROWS = (
+    select(Employee.id, Employee.name, Employee.email, Employee.department).where(Employee.is_active == True)
+)
+MANAGER_LINKS = select(Employee.id, Employee.manager_id).where(Employee.manager_id.is_not(None))
+ORG_SNAPSHOT_ROWS = select(
+    Employee.id, Employee.email, Employee.department, Employee.is_active, Employee.is_admin, Employee.joining_date
+)
+ORG_SNAPSHOT_CHANGED = ORG_SNAPSHOT_ROWS.where(Employee.updated_at >= bindparam("since"))
+
+# An employee and every manager above them; UNION rather than UNION ALL so a cycle still terminates
+_manager_chain = (
+    select(Employee.id, Employee.manager_id)
+    .where(Employee.id == bindparam("employee_id"))
+    .cte("manager_chain", recursive=True)
+)
+_manager_chain = _manager_chain.union(
+    select(Employee.id, Employee.manager_id).join(_manager_chain, Employee.id == _manager_chain.c.manager_id)
+)
+MANAGER_CHAIN = select(_manager_chain.c.id)
+
+@traced
 class EmployeeService:
     def __init__(self, db: Session):
         self.db = db
@@ -13,20 +49,23 @@ class EmployeeService:
     def create_employee(self, employee_data: EmployeeCreate) -> Employee:
         """Create a new employee"""
         
-        existing_employee = self.db.query(Employee).filter(Employee.email == employee_data.email).first()
+        existing_employee = self.get_principal_by_email(employee_data.email)
         if existing_employee:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Employee with this email already exists"
             )
         
+        if employee_data.manager_id is not None:
+            self._check_manager(None, employee_data.manager_id)
         
         db_employee = Employee(
             name=employee_data.name,
             email=employee_data.email,
             department=employee_data.department,
             joining_date=employee_data.joining_date,
-            is_admin=employee_data.is_admin or False
+            is_admin=employee_data.is_admin or False,
+            manager_id=employee_data.manager_id
         )
         
        
@@ -37,6 +76,10 @@ class EmployeeService:
             self.db.add(db_employee)
             self.db.commit()
             self.db.refresh(db_employee)
+            search_index_cache.invalidate()
+            org_snapshot_cache.invalidate()
+            if db_employee.manager_id is not None:
+                hierarchy_cache.invalidate()
             return db_employee
         except IntegrityError:
             self.db.rollback()
@@ -46,33 +89,100 @@ class EmployeeService:
             )
     
     def get_employee(self, employee_id: int) -> Optional[Employee]:
-        """Get employee by ID"""
-        return self.db.query(Employee).filter(Employee.id == employee_id).first()
+        """Get employee by ID, from the identity map when already loaded"""
+        return self.db.get(Employee, employee_id)
     
     def get_employee_by_email(self, email: str) -> Optional[Employee]:
         """Get employee by email"""
-        return self.db.query(Employee).filter(Employee.email == email).first()
+        return self.db.scalars(EMPLOYEE_BY_EMAIL, {"email": email}).first()
+    
+    def get_principal(self, employee_id: int) -> Optional[Union[Principal, Employee]]:
+        """Employee for checks that only read id, email, department, flags or joining date
+
+        Served from the org snapshot when ORG_SNAPSHOT_ENABLED is set, otherwise the ORM object.
+        """
+        if settings.org_snapshot_enabled:
+            return self.get_org_snapshot().get(employee_id)
+        return self.get_employee(employee_id)
+    
+    def get_principal_by_email(self, email: str) -> Optional[Union[Principal, Employee]]:
+        """get_principal by email"""
+        if settings.org_snapshot_enabled:
+            return self.get_org_snapshot().get_by_email(email)
+        return self.get_employee_by_email(email)
+    
+    def get_org_snapshot(self) -> OrgSnapshot:
+        """Compact snapshot of the whole org, refreshed with the employees changed since the last refresh"""
+        return org_snapshot_cache.get(self._org_snapshot_rows)
+    
+    def _org_snapshot_rows(self, watermark):
+        # Same overlap as delta sync, for transactions that commit after the watermark was read
+        new_watermark = self.db.scalar(select(func.now()))
+        if watermark is None:
+            return new_watermark, self.db.execute(ORG_SNAPSHOT_ROWS).all()
+        since = watermark - timedelta(seconds=settings.sync_overlap_seconds)
+        return new_watermark, self.db.execute(ORG_SNAPSHOT_CHANGED, {"since": since}).all()
+    
+    def get_employees_by_ids(self, employee_ids) -> List[Employee]:
+        """Load several employees in one query, in no particular order"""
+        return self.db.scalars(EMPLOYEES_BY_IDS, {"ids": list(employee_ids)}).all()
     
     def get_employees(self, skip: int = 0, limit: int = 100, active_only: bool = True) -> List[Employee]:
         """Get list of employees"""
-        query = self.db.query(Employee)
-        if active_only:
-            query = query.filter(Employee.is_active == True)
-        return query.offset(skip).limit(limit).all()
+        statement = ACTIVE_EMPLOYEES_PAGE if active_only else EMPLOYEES_PAGE
+        return self.db.scalars(statement, {"skip": skip, "limit": limit}).all()
+    
+    def search_employees(self, query: str, limit: int = 10) -> List[Employee]:
+        """Prefix and fuzzy search over active employees' name, email and department"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            return self._search_employees_trigram(query, limit)
+        
+        employee_ids = search_index_cache.get(self._search_index_rows).search(query, limit)
+        if not employee_ids:
+            return []
+        employees = {e.id: e for e in self.get_employees_by_ids(employee_ids)}
+        return [employees[employee_id] for employee_id in employee_ids if employee_id in employees]
     
-    def update_employee(self, employee_id: int, employee_update: EmployeeUpdate) -> Optional[Employee]:
+    def _search_index_rows(self):
+        return self.db.execute(SEARCH_INDEX_ROWS).all()
+    
+    def _search_employees_trigram(self, query: str, limit: int) -> List[Employee]:
+        """Search backed by the pg_trgm GIN indexes on employees"""
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        columns = (Employee.name, Employee.email, Employee.department)
+        is_prefix = or_(
+            *(column.ilike(f"{escaped}%", escape="\\") for column in columns),
+            Employee.name.ilike(f"% {escaped}%", escape="\\")
+        )
+        similarity = func.greatest(*(func.similarity(column, query) for column in columns))
+        rank = similarity + case((is_prefix, 1.0), else_=0.0)
+        
+        return self.db.query(Employee).filter(
+            Employee.is_active == True,
+            or_(is_prefix, *(column.op("%")(query) for column in columns))
+        ).order_by(rank.desc(), Employee.name).limit(limit).all()
+    
+    def update_employee(self, employee_id: int, employee_update: EmployeeUpdate, expected_version: int = None) -> Optional[Employee]:
         """Update employee"""
         employee = self.get_employee(employee_id)
         if not employee:
             return None
         
+        check_version(employee.version, expected_version, "Employee has been modified, reload and retry")
+        
         update_data = employee_update.dict(exclude_unset=True)
+        if update_data.get("manager_id") is not None:
+            self._check_manager(employee_id, update_data["manager_id"])
         for field, value in update_data.items():
             setattr(employee, field, value)
         
         try:
-            self.db.commit()
+            commit_or_conflict(self.db, "Employee was modified concurrently, reload and retry")
             self.db.refresh(employee)
+            search_index_cache.invalidate()
+            org_snapshot_cache.invalidate()
+            if "manager_id" in update_data:
+                hierarchy_cache.invalidate()
             return employee
         except IntegrityError:
             self.db.rollback()
@@ -88,9 +198,30 @@ class EmployeeService:
             return False
         
         employee.is_active = False
-        self.db.commit()
+        commit_or_conflict(self.db, "Employee was modified concurrently, reload and retry")
+        search_index_cache.invalidate()
+        org_snapshot_cache.invalidate()
         return True
     
+    def get_hierarchy(self) -> OrgHierarchy:
+        """Cached manager links of the whole org"""
+        return hierarchy_cache.get(lambda: self.db.execute(MANAGER_LINKS).all())
+    
+    def _check_manager(self, employee_id: Optional[int], manager_id: int) -> None:
+        """Reject a manager that does not exist, is inactive, or would put the employee in a reporting cycle"""
+        manager = self.get_principal(manager_id)
+        if not manager or not manager.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Manager not found"
+            )
+        
+        if employee_id is not None and employee_id in self.db.scalars(MANAGER_CHAIN, {"employee_id": manager_id}).all():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Employee cannot report to themselves or to someone who reports to them"
+            )
+    
     def update_leave_balance(self, employee_id: int, new_balance: float) -> Optional[Employee]:
         """Update employee leave balance"""
         employee = self.get_employee(employee_id)
@@ -98,6 +229,6 @@ class EmployeeService:
             return None
         
         employee.leave_balance = new_balance
-        self.db.commit()
+        commit_or_conflict(self.db, "Employee was modified concurrently, reload and retry")
         self.db.refresh(employee)
         return employee
\ No newline at end of file
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.schemas.leave import LeaveRequest as LeaveRequestSchema, LeaveRequestCreate
+from app.services.leave_service import LeaveService
+
+logger = logging.getLogger(__name__)
+
+Submission = Tuple[LeaveRequestCreate, asyncio.Future]
+
+
+class LeaveSubmissionBatcher:
+    """Coalesces leave submissions arriving within a short window into one INSERT and one commit"""
+
+    def __init__(self, session_factory: Callable[[], Session], max_batch: int = 100, max_wait_ms: float = 5.0):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._loop(), name="leave-batcher")
+
+    async def stop(self) -> None:
+        """Flush everything already queued, then stop"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def submit(self, leave_data: LeaveRequestCreate) -> LeaveRequestSchema:
+        """Queue one submission and wait for its own result from the batch it lands in"""
+        if self._task is None:
+            raise RuntimeError("Leave batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((leave_data, future))
+        return await future
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch: List[Submission] = [first]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                results = await asyncio.to_thread(self._flush, [leave_data for leave_data, _ in batch])
+            except Exception as e:
+                logger.exception("Leave batch of %d failed", len(batch))
+                results = [e] * len(batch)
+            self.batches += 1
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _flush(self, submissions: List[LeaveRequestCreate]) -> list:
+        db = self.session_factory()
+        try:
+            try:
+                results = LeaveService(db).create_leave_requests(submissions)
+            except Exception:
+                # One bad row fails the whole INSERT; fall back to one transaction per submission
+                db.rollback()
+                logger.warning("Batched insert failed, retrying %d submissions one by one", len(submissions), exc_info=True)
+                results = []
+                for leave_data in submissions:
+                    try:
+                        results.append(LeaveService(db).create_leave_request(leave_data))
+                    except Exception as e:
+                        db.rollback()
+                        results.append(e)
+            return [
+                result if isinstance(result, Exception) else LeaveRequestSchema.model_validate(result)
+                for result in results
+            ]
+        finally:
+            db.close()
+
+
+# Created rows come back from RETURNING, so there is nothing to reload after commit
+leave_batcher = LeaveSubmissionBatcher(
+    partial(SessionLocal, expire_on_commit=False),
+    max_batch=settings.leave_batch_max_size,
+    max_wait_ms=settings.leave_batch_max_wait_ms
+)
@@ -0,0 +1,135 @@
+import json
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.db.models.leave import LeaveType
+from app.schemas.leave_policy import LeavePolicyConfig, LeaveTypePolicy
+
+
+def business_days(start_date: date, end_date: date) -> int:
+    """Count weekdays between two dates, inclusive"""
+    if end_date < start_date:
+        return 0
+
+    full_weeks, remainder = divmod((end_date - start_date).days + 1, 7)
+    days = full_weeks * 5
+    first_weekday = start_date.weekday()
+    for offset in range(remainder):
+        if (first_weekday + offset) % 7 < 5:
+            days += 1
+    return days
+
+
+class CompiledLeavePolicy:
+    """Rules for one leave type, preprocessed so each check is constant or logarithmic time"""
+
+    __slots__ = (
+        "leave_type", "uses_balance", "annual_quota", "probation", "max_consecutive_days",
+        "carry_forward_max", "_blackout_starts", "_blackout_ends"
+    )
+
+    def __init__(self, leave_type: LeaveType, policy: LeaveTypePolicy):
+        self.leave_type = leave_type
+        self.uses_balance = policy.uses_balance
+        self.annual_quota = policy.annual_quota
+        self.probation = timedelta(days=policy.probation_days) if policy.probation_days else None
+        self.max_consecutive_days = policy.max_consecutive_days
+        self.carry_forward_max = policy.carry_forward_max
+
+        merged: List[List[date]] = []
+        for period in sorted(policy.blackout_periods, key=lambda p: p.start_date):
+            if merged and period.start_date <= merged[-1][1] + timedelta(days=1):
+                merged[-1][1] = max(merged[-1][1], period.end_date)
+            else:
+                merged.append([period.start_date, period.end_date])
+        self._blackout_starts = [period[0] for period in merged]
+        self._blackout_ends = [period[1] for period in merged]
+
+    def blackout_overlap(self, start_date: date, end_date: date) -> Optional[Tuple[date, date]]:
+        """Return the blackout period overlapping the given dates, if any"""
+        i = bisect_right(self._blackout_starts, end_date) - 1
+        if i >= 0 and self._blackout_ends[i] >= start_date:
+            return self._blackout_starts[i], self._blackout_ends[i]
+        return None
+
+    def violations(
+        self,
+        joining_date: date,
+        leave_balance: float,
+        start_date: date,
+        end_date: date,
+        days_requested: int,
+        used_days: float = 0
+    ) -> List[str]:
+        """Return the rule violations for a request, empty when it is allowed"""
+        label = self.leave_type.value.capitalize()
+        errors = []
+
+        if self.probation is not None and start_date < joining_date + self.probation:
+            errors.append(
+                f"{label} leave is not available during probation (eligible from {joining_date + self.probation})"
+            )
+
+        if self.max_consecutive_days is not None and (end_date - start_date).days + 1 > self.max_consecutive_days:
+            errors.append(f"{label} leave cannot exceed {self.max_consecutive_days} consecutive days")
+
+        blackout = self.blackout_overlap(start_date, end_date)
+        if blackout is not None:
+            errors.append(f"{label} leave is not allowed between {blackout[0]} and {blackout[1]}")
+
+        if self.annual_quota is not None and used_days + days_requested > self.annual_quota:
+            errors.append(
+                f"Annual {self.leave_type.value} leave quota exceeded. "
+                f"Available: {max(self.annual_quota - used_days, 0)} days, Requested: {days_requested} days"
+            )
+
+        if self.uses_balance and days_requested > leave_balance:
+            errors.append(
+                f"Insufficient leave balance. Available: {leave_balance} days, Requested: {days_requested} days"
+            )
+
+        return errors
+
+
+def load_leave_policy_config(tenant: str = "default") -> LeavePolicyConfig:
+    """Read leave policies from LEAVE_POLICY_FILE; without one every type uses the shared balance"""
+    if not settings.leave_policy_file:
+        return LeavePolicyConfig()
+
+    with open(settings.leave_policy_file) as f:
+        raw = json.load(f)
+
+    if "tenants" in raw:
+        raw = raw["tenants"].get(tenant, raw["tenants"].get("default", {}))
+    return LeavePolicyConfig(**raw)
+
+
+@lru_cache(maxsize=32)
+def _compile_leave_policies(tenant: str) -> Dict[LeaveType, CompiledLeavePolicy]:
+    config = load_leave_policy_config(tenant)
+    return {
+        leave_type: CompiledLeavePolicy(leave_type, config.types.get(leave_type, config.default))
+        for leave_type in LeaveType
+    }
+
+
+_compiled_generation = 0
+
+
+def get_leave_policies(tenant: str = "default") -> Dict[LeaveType, CompiledLeavePolicy]:
+    """Compiled policies for every leave type, built once per tenant until reloaded in any worker"""
+    global _compiled_generation
+    generation = invalidation_bus.generation("leave_policies")
+    if generation != _compiled_generation:
+        _compile_leave_policies.cache_clear()
+        _compiled_generation = generation
+    return _compile_leave_policies(tenant)
+
+
+def reload_leave_policies() -> None:
+    _compile_leave_policies.cache_clear()
+    invalidation_bus.bump("leave_policies")
@@ -1,13 +1,83 @@
-from typing import List, Optional
-from datetime import date, datetime
+import logging
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, Union
+from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, bindparam, or_, func, insert, select
 from fastapi import HTTPException, status
-from app.db.models.leave import LeaveRequest, LeaveStatus
+from app.db.models.leave import LeaveApproval, LeaveRequest, LeaveStatus, LeaveType
 from app.db.models.employee import Employee
-from app.schemas.leave import LeaveRequestCreate, LeaveRequestUpdate
+from app.schemas.leave import LeaveRequestBase, LeaveRequestCreate, LeaveRequestUpdate
 from app.services.employee_service import EmployeeService
+from app.services.leave_policy import business_days, get_leave_policies
+from app.services.org_hierarchy import get_approval_chain, pending_step
+from app.services.report_service import ReportService
+from app.services.concurrency import check_version, commit_or_conflict
+from app.services.coverage import daily_absences
+from app.core.config import settings
+from app.core.tracing import traced
 
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (LeaveStatus.PENDING, LeaveStatus.APPROVED)
+
+# Built once so every call reuses the same statement and its compiled form.
+# Two ranges overlap exactly when each starts on or before the other ends.
+OVERLAPPING_LEAVE = select(LeaveRequest.id).where(
+    LeaveRequest.employee_id == bindparam("employee_id"),
+    LeaveRequest.status.in_(ACTIVE_STATUSES),
+    LeaveRequest.start_date <= bindparam("end_date"),
+    LeaveRequest.end_date >= bindparam("start_date")
+).limit(1)
+OVERLAPPING_OTHER_LEAVE = OVERLAPPING_LEAVE.where(LeaveRequest.id != bindparam("exclude_id"))
+
+_booked_year = func.extract("year", LeaveRequest.start_date)
+USED_DAYS = select(
+    _booked_year, LeaveRequest.leave_type, func.sum(LeaveRequest.days_requested)
+).where(
+    LeaveRequest.employee_id == bindparam("employee_id"),
+    LeaveRequest.start_date >= bindparam("first_day"),
+    LeaveRequest.start_date < bindparam("after_last_day"),
+    LeaveRequest.status.in_(ACTIVE_STATUSES)
+).group_by(_booked_year, LeaveRequest.leave_type)
+
+BOOKED_RANGES = select(LeaveRequest.start_date, LeaveRequest.end_date).where(
+    LeaveRequest.employee_id == bindparam("employee_id"),
+    LeaveRequest.status.in_(ACTIVE_STATUSES),
+    LeaveRequest.start_date <= bindparam("window_end"),
+    LeaveRequest.end_date >= bindparam("window_start")
+)
+
+LEAVE_REQUESTS_PAGE = select(LeaveRequest).offset(bindparam("skip")).limit(bindparam("limit"))
+EMPLOYEE_LEAVE_REQUESTS_PAGE = (
+    select(LeaveRequest)
+    .where(LeaveRequest.employee_id == bindparam("employee_id"))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# Other people of a department away (or asking to be) during a range; one pass over
+# ix_leave_requests_start_end joined to ix_employees_department
+DEPARTMENT_LEAVE_RANGES = select(LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.status).join(
+    Employee, Employee.id == LeaveRequest.employee_id
+).where(
+    Employee.department == bindparam("department"),
+    LeaveRequest.employee_id != bindparam("employee_id"),
+    LeaveRequest.status.in_(ACTIVE_STATUSES),
+    LeaveRequest.start_date <= bindparam("end_date"),
+    LeaveRequest.end_date >= bindparam("start_date")
+)
+DEPARTMENT_HEADCOUNT = select(func.count(Employee.id)).where(
+    Employee.department == bindparam("department"),
+    Employee.is_active == True
+)
+
+# Everyone reporting to :manager_id, directly or indirectly
+_team = select(Employee.id).where(Employee.manager_id == bindparam("manager_id")).cte("team", recursive=True)
+_team = _team.union(select(Employee.id).join(_team, Employee.manager_id == _team.c.id))
+TEAM_MEMBER_IDS = select(_team.c.id)
+
+@traced
 class LeaveService:
     def __init__(self, db: Session):
         self.db = db
@@ -15,40 +85,29 @@ class LeaveService:
     
     def _calculate_business_days(self, start_date: date, end_date: date) -> int:
         """Calculate business days between two dates (excluding weekends)"""
-        total_days = 0
-        current_date = start_date
-        
-        while current_date <= end_date:
-            
-            if current_date.weekday() < 5:  
-                total_days += 1
-            current_date = datetime(current_date.year, current_date.month, current_date.day)
-            current_date = current_date.replace(day=current_date.day + 1).date()
-        
-        return total_days
+        return business_days(start_date, end_date)
     
     def _check_overlapping_leaves(self, employee_id: int, start_date: date, end_date: date, exclude_request_id: int = None) -> bool:
         """Check if there are overlapping approved/pending leave requests"""
-        query = self.db.query(LeaveRequest).filter(
-            and_(
-                LeaveRequest.employee_id == employee_id,
-                LeaveRequest.status.in_([LeaveStatus.PENDING, LeaveStatus.APPROVED]),
-                or_(
-                    and_(LeaveRequest.start_date <= start_date, LeaveRequest.end_date >= start_date),
-                    and_(LeaveRequest.start_date <= end_date, LeaveRequest.end_date >= end_date),
-                    and_(LeaveRequest.start_date >= start_date, LeaveRequest.end_date <= end_date)
-                )
-            )
-        )
-        
+        params = {"employee_id": employee_id, "start_date": start_date, "end_date": end_date}
+        statement = OVERLAPPING_LEAVE
         if exclude_request_id:
-            query = query.filter(LeaveRequest.id != exclude_request_id)
+            statement = OVERLAPPING_OTHER_LEAVE
+            params["exclude_id"] = exclude_request_id
         
-        return query.first() is not None
+        return self.db.execute(statement, params).first() is not None
     
-    def create_leave_request(self, leave_data: LeaveRequestCreate) -> LeaveRequest:
-        """Create a new leave request with validation"""
-        employee = self.employee_service.get_employee(leave_data.employee_id)
+    def _used_days(self, employee_id: int, first_year: int, last_year: int) -> Dict[Tuple[int, LeaveType], float]:
+        """Days already booked (pending or approved) per year and leave type"""
+        rows = self.db.execute(USED_DAYS, {
+            "employee_id": employee_id,
+            "first_day": date(first_year, 1, 1),
+            "after_last_day": date(last_year + 1, 1, 1)
+        }).all()
+        return {(int(row_year), leave_type): float(days or 0) for row_year, leave_type, days in rows}
+    
+    def _check_new_leave(self, employee: Optional[Employee], leave_data: LeaveRequestCreate, used_days: float) -> int:
+        """Validate a submission against the employee and leave policy; returns the business days requested"""
         if not employee:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -82,12 +141,38 @@ class LeaveService:
                 detail="Invalid leave duration"
             )
         
-        if days_requested > employee.leave_balance:
+        violations = get_leave_policies()[leave_data.leave_type].violations(
+            employee.joining_date,
+            employee.leave_balance,
+            leave_data.start_date,
+            leave_data.end_date,
+            days_requested,
+            used_days
+        )
+        if violations:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Insufficient leave balance. Available: {employee.leave_balance} days, Requested: {days_requested} days"
+                detail=violations[0]
             )
         
+        return days_requested
+    
+    def _first_approval_step(self, employee: Employee) -> int:
+        """Step a new request waits on; admins take it at the last step when no step applies"""
+        chain = get_approval_chain()
+        step = pending_step(chain, employee.manager_id is not None, 0)
+        return len(chain) - 1 if step is None else step
+    
+    def create_leave_request(self, leave_data: LeaveRequestCreate) -> LeaveRequest:
+        """Create a new leave request with validation"""
+        employee = self.employee_service.get_employee(leave_data.employee_id)
+        
+        used_days = 0
+        if employee and get_leave_policies()[leave_data.leave_type].annual_quota is not None:
+            year = leave_data.start_date.year
+            used_days = self._used_days(employee.id, year, year).get((year, leave_data.leave_type), 0)
+        
+        days_requested = self._check_new_leave(employee, leave_data, used_days)
         
         if self._check_overlapping_leaves(leave_data.employee_id, leave_data.start_date, leave_data.end_date):
             raise HTTPException(
@@ -102,27 +187,206 @@ class LeaveService:
             end_date=leave_data.end_date,
             leave_type=leave_data.leave_type,
             reason=leave_data.reason,
-            days_requested=days_requested
+            days_requested=days_requested,
+            approval_step=self._first_approval_step(employee)
         )
         
         self.db.add(db_leave_request)
         self.db.commit()
         self.db.refresh(db_leave_request)
+        logger.info(
+            "Leave request %s submitted", db_leave_request.id,
+            extra={"leave_id": db_leave_request.id, "employee_id": db_leave_request.employee_id}
+        )
         return db_leave_request
     
+    def create_leave_requests(self, submissions: List[LeaveRequestCreate]) -> List[Union[LeaveRequest, HTTPException]]:
+        """Validate and insert a batch of submissions with one multi-row INSERT and one commit
+
+        Each submission is checked against an in-memory view of its employee's booked
+        leave, which includes the submissions accepted earlier in the same batch.
+        Returns, in order, the created request or the HTTPException it was rejected with.
+        """
+        if not submissions:
+            return []
+        
+        employee_ids = {item.employee_id for item in submissions}
+        employees = {employee.id: employee for employee in self.employee_service.get_employees_by_ids(employee_ids)}
+        
+        first_start = min(item.start_date for item in submissions)
+        last_end = max(item.end_date for item in submissions)
+        first_year = first_start.year
+        last_year = max(item.start_date.year for item in submissions)
+        booked_rows = self.db.query(
+            LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date,
+            LeaveRequest.leave_type, LeaveRequest.days_requested
+        ).filter(
+            LeaveRequest.employee_id.in_(employee_ids),
+            LeaveRequest.status.in_(ACTIVE_STATUSES),
+            LeaveRequest.start_date < date(max(last_year, last_end.year) + 1, 1, 1),
+            or_(LeaveRequest.start_date >= date(first_year, 1, 1), LeaveRequest.end_date >= first_start)
+        ).all()
+        
+        booked: Dict[int, List[Tuple[date, date]]] = {employee_id: [] for employee_id in employee_ids}
+        used: Dict[Tuple[int, int, LeaveType], float] = {}
+        for employee_id, start_date, end_date, leave_type, days in booked_rows:
+            booked[employee_id].append((start_date, end_date))
+            key = (employee_id, start_date.year, leave_type)
+            used[key] = used.get(key, 0) + days
+        
+        results: List[Union[LeaveRequest, HTTPException]] = []
+        accepted: List[Tuple[int, dict]] = []
+        for position, item in enumerate(submissions):
+            usage_key = (item.employee_id, item.start_date.year, item.leave_type)
+            try:
+                days_requested = self._check_new_leave(employees.get(item.employee_id), item, used.get(usage_key, 0))
+                intervals = booked[item.employee_id]
+                if any(start <= item.end_date and end >= item.start_date for start, end in intervals):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Overlapping leave request exists"
+                    )
+            except HTTPException as e:
+                results.append(e)
+                continue
+            
+            intervals.append((item.start_date, item.end_date))
+            used[usage_key] = used.get(usage_key, 0) + days_requested
+            accepted.append((position, {
+                "employee_id": item.employee_id,
+                "start_date": item.start_date,
+                "end_date": item.end_date,
+                "leave_type": item.leave_type,
+                "reason": item.reason,
+                "days_requested": days_requested,
+                "approval_step": self._first_approval_step(employees[item.employee_id])
+            }))
+            results.append(None)
+        
+        if accepted:
+            created = self.db.scalars(
+                insert(LeaveRequest).returning(LeaveRequest, sort_by_parameter_order=True),
+                [row for _, row in accepted]
+            ).all()
+            self.db.commit()
+            for (position, _), leave_request in zip(accepted, created):
+                results[position] = leave_request
+            logger.info("Inserted %d of %d batched leave requests", len(created), len(submissions))
+        
+        return results
+    
     def get_leave_request(self, leave_id: int) -> Optional[LeaveRequest]:
         """Get leave request by ID"""
-        return self.db.query(LeaveRequest).filter(LeaveRequest.id == leave_id).first()
+        return self.db.get(LeaveRequest, leave_id)
     
     def get_leave_requests(self, employee_id: int = None, skip: int = 0, limit: int = 100) -> List[LeaveRequest]:
         """Get leave requests with optional employee filter"""
-        query = self.db.query(LeaveRequest)
         if employee_id:
-            query = query.filter(LeaveRequest.employee_id == employee_id)
-        return query.offset(skip).limit(limit).all()
+            return self.db.scalars(
+                EMPLOYEE_LEAVE_REQUESTS_PAGE, {"employee_id": employee_id, "skip": skip, "limit": limit}
+            ).all()
+        return self.db.scalars(LEAVE_REQUESTS_PAGE, {"skip": skip, "limit": limit}).all()
+    
+    def _current_step(self, leave_request: LeaveRequest, approver: Optional[Employee]) -> Tuple[int, str]:
+        """Step the request is waiting on and its role, checking the approver may decide it"""
+        chain = get_approval_chain()
+        # The chain may have been shortened since the request was submitted
+        step = min(leave_request.approval_step, len(chain) - 1)
+        role = chain[step]
+        if approver is None or approver.is_admin:
+            return step, role
+        
+        if (
+            role == "manager"
+            and approver.id != leave_request.employee_id
+            and self.employee_service.get_hierarchy().is_above(approver.id, leave_request.employee_id)
+        ):
+            return step, role
+        
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    def _record_step(self, leave_request: LeaveRequest, step: int, role: str, approver: Optional[Employee], decision: LeaveStatus, comment: str) -> None:
+        # Linked through the relationship so the versioned UPDATE of the request is flushed first
+        self.db.add(LeaveApproval(
+            leave_request=leave_request,
+            step=step,
+            role=role,
+            approver_id=approver.id if approver else None,
+            decision=decision,
+            comment=comment
+        ))
     
-    def approve_leave_request(self, leave_id: int, admin_comment: str = None) -> Optional[LeaveRequest]:
-        """Approve a leave request"""
+    def get_coverage(self, leave_request: LeaveRequest) -> dict:
+        """Department staffing on each weekday of a request, if it were approved
+
+        available counts the active headcount less the people on approved leave and the
+        requester; pending_out shows who else is waiting for a decision on those days.
+        """
+        employee = self.employee_service.get_principal(leave_request.employee_id)
+        department = employee.department if employee else ""
+        headcount = self.db.execute(DEPARTMENT_HEADCOUNT, {"department": department}).scalar_one()
+        ranges = self.db.execute(DEPARTMENT_LEAVE_RANGES, {
+            "department": department,
+            "employee_id": leave_request.employee_id,
+            "start_date": leave_request.start_date,
+            "end_date": leave_request.end_date
+        }).all()
+        
+        days = daily_absences(
+            ((start_date, end_date, leave_status == LeaveStatus.APPROVED) for start_date, end_date, leave_status in ranges),
+            leave_request.start_date,
+            leave_request.end_date
+        )
+        return {
+            "leave_request_id": leave_request.id,
+            "department": department,
+            "minimum_staffing": settings.department_min_staffing,
+            "days": [
+                {
+                    "day": day,
+                    "headcount": headcount,
+                    "approved_out": approved_out,
+                    "pending_out": pending_out,
+                    "available": max(headcount - approved_out - 1, 0)
+                }
+                for day, approved_out, pending_out in days
+            ]
+        }
+    
+    def preview_coverage(self, leave_id: int, approver: Employee = None) -> dict:
+        """Coverage of a leave request, for whoever may decide its current step"""
+        leave_request = self.get_leave_request(leave_id)
+        if not leave_request:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Leave request not found"
+            )
+        
+        self._current_step(leave_request, approver)
+        return self.get_coverage(leave_request)
+    
+    def _check_staffing(self, leave_request: LeaveRequest) -> None:
+        """Refuse a final approval that would leave its department below DEPARTMENT_MIN_STAFFING"""
+        minimum = settings.department_min_staffing
+        if minimum <= 0:
+            return
+        
+        coverage = self.get_coverage(leave_request)
+        short = [day for day in coverage["days"] if day["available"] < minimum]
+        if short:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Approving would leave {coverage['department']} with {short[0]['available']} available "
+                    f"on {short[0]['day'].isoformat()}, below the minimum staffing of {minimum}"
+                )
+            )
+    
+    def approve_leave_request(self, leave_id: int, admin_comment: str = None, expected_version: int = None, approver: Employee = None) -> Optional[LeaveRequest]:
+        """Approve the current step of a leave request; the request is approved once its last step is"""
         leave_request = self.get_leave_request(leave_id)
         if not leave_request:
             raise HTTPException(
@@ -136,21 +400,38 @@ class LeaveService:
                 detail="Only pending leave requests can be approved"
             )
         
+        step, role = self._current_step(leave_request, approver)
+        check_version(leave_request.version, expected_version, "Leave request has been modified, reload and retry")
         
-        leave_request.status = LeaveStatus.APPROVED
+        self._record_step(leave_request, step, role, approver, LeaveStatus.APPROVED, admin_comment)
         leave_request.admin_comment = admin_comment
         
-
         employee = self.employee_service.get_employee(leave_request.employee_id)
-        if employee:
+        next_step = pending_step(get_approval_chain(), bool(employee and employee.manager_id is not None), step + 1)
+        if next_step is not None:
+            leave_request.approval_step = next_step
+            commit_or_conflict(self.db, "Leave request was decided concurrently, reload and retry")
+            self.db.refresh(leave_request)
+            logger.info(
+                "Leave request %s approved at step %s (%s)", leave_id, step, role,
+                extra={"leave_id": leave_id, "employee_id": leave_request.employee_id}
+            )
+            return leave_request
+        
+        self._check_staffing(leave_request)
+        leave_request.status = LeaveStatus.APPROVED
+        if employee and get_leave_policies()[leave_request.leave_type].uses_balance:
             employee.leave_balance -= leave_request.days_requested
+        if employee:
+            ReportService(self.db).record_decision(leave_request, employee.department, approved=True)
         
-        self.db.commit()
+        commit_or_conflict(self.db, "Leave request was decided concurrently, reload and retry")
         self.db.refresh(leave_request)
+        logger.info("Leave request %s approved", leave_id, extra={"leave_id": leave_id, "employee_id": leave_request.employee_id})
         return leave_request
     
-    def reject_leave_request(self, leave_id: int, admin_comment: str = None) -> Optional[LeaveRequest]:
-        """Reject a leave request"""
+    def reject_leave_request(self, leave_id: int, admin_comment: str = None, expected_version: int = None, approver: Employee = None) -> Optional[LeaveRequest]:
+        """Reject a leave request at its current step, which ends the approval chain"""
         leave_request = self.get_leave_request(leave_id)
         if not leave_request:
             raise HTTPException(
@@ -164,13 +445,56 @@ class LeaveService:
                 detail="Only pending leave requests can be rejected"
             )
         
+        step, role = self._current_step(leave_request, approver)
+        check_version(leave_request.version, expected_version, "Leave request has been modified, reload and retry")
+        
+        self._record_step(leave_request, step, role, approver, LeaveStatus.REJECTED, admin_comment)
         leave_request.status = LeaveStatus.REJECTED
         leave_request.admin_comment = admin_comment
         
-        self.db.commit()
+        employee = self.employee_service.get_employee(leave_request.employee_id)
+        if employee:
+            ReportService(self.db).record_decision(leave_request, employee.department, approved=False)
+        
+        commit_or_conflict(self.db, "Leave request was decided concurrently, reload and retry")
         self.db.refresh(leave_request)
+        logger.info("Leave request %s rejected", leave_id, extra={"leave_id": leave_id, "employee_id": leave_request.employee_id})
         return leave_request
     
+    def get_pending_approvals(self, approver: Employee, skip: int = 0, limit: int = 100) -> List[LeaveRequest]:
+        """Pending requests waiting on a step this approver can decide
+
+        Managers see manager steps for their whole reporting line, found with one recursive
+        CTE; admins see admin steps, plus manager steps of employees who have no manager.
+        """
+        chain = get_approval_chain()
+        manager_steps = [step for step, role in enumerate(chain) if role == "manager"]
+        admin_steps = [step for step, role in enumerate(chain) if role == "admin"]
+        
+        waiting = []
+        # The cached hierarchy spares the query for the many employees who manage nobody
+        if manager_steps and self.employee_service.get_hierarchy().has_reports(approver.id):
+            waiting.append(and_(
+                LeaveRequest.approval_step.in_(manager_steps),
+                LeaveRequest.employee_id.in_(TEAM_MEMBER_IDS)
+            ))
+        if approver.is_admin:
+            waiting.append(LeaveRequest.approval_step.in_(admin_steps))
+            if manager_steps:
+                waiting.append(and_(LeaveRequest.approval_step.in_(manager_steps), Employee.manager_id.is_(None)))
+        if not waiting:
+            return []
+        
+        statement = (
+            select(LeaveRequest)
+            .join(Employee, Employee.id == LeaveRequest.employee_id)
+            .where(LeaveRequest.status == LeaveStatus.PENDING, or_(*waiting))
+            .order_by(LeaveRequest.start_date, LeaveRequest.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return self.db.scalars(statement, {"manager_id": approver.id}).all()
+    
     def get_employee_leave_balance(self, employee_id: int) -> float:
         """Get employee's current leave balance"""
         employee = self.employee_service.get_employee(employee_id)
@@ -179,4 +503,73 @@ class LeaveService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Employee not found"
             )
-        return employee.leave_balance
\ No newline at end of file
+        return employee.leave_balance
+    
+    def evaluate_leave_requests(self, employee_id: int, requests: List[LeaveRequestBase]) -> List[dict]:
+        """Check a set of hypothetical requests against policy in one pass, in date order"""
+        employee = self.employee_service.get_employee(employee_id)
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+        
+        if not requests:
+            return []
+        
+        policies = get_leave_policies()
+        window_start = min(r.start_date for r in requests)
+        window_end = max(r.end_date for r in requests)
+        used = self._used_days(employee_id, window_start.year, max(r.start_date.year for r in requests))
+        
+        booked = sorted(self.db.execute(BOOKED_RANGES, {
+            "employee_id": employee_id, "window_start": window_start, "window_end": window_end
+        }).all())
+        booked_starts = [start for start, _ in booked]
+        booked_ends = [end for _, end in booked]
+        
+        balance = employee.leave_balance
+        results = []
+        for index in sorted(range(len(requests)), key=lambda i: requests[i].start_date):
+            item = requests[index]
+            policy = policies[item.leave_type]
+            days_requested = business_days(item.start_date, item.end_date)
+            usage_key = (item.start_date.year, item.leave_type)
+            
+            violations = []
+            if item.start_date < employee.joining_date:
+                violations.append("Cannot apply for leave before joining date")
+            if days_requested <= 0:
+                violations.append("Invalid leave duration")
+            violations.extend(policy.violations(
+                employee.joining_date,
+                balance,
+                item.start_date,
+                item.end_date,
+                days_requested,
+                used.get(usage_key, 0)
+            ))
+            i = bisect_right(booked_starts, item.end_date) - 1
+            if i >= 0 and booked_ends[i] >= item.start_date:
+                violations.append("Overlapping leave request exists")
+            
+            if not violations:
+                used[usage_key] = used.get(usage_key, 0) + days_requested
+                if policy.uses_balance:
+                    balance -= days_requested
+                position = bisect_right(booked_starts, item.start_date)
+                booked_starts.insert(position, item.start_date)
+                booked_ends.insert(position, item.end_date)
+            
+            results.append({
+                "index": index,
+                "start_date": item.start_date,
+                "end_date": item.end_date,
+                "leave_type": item.leave_type,
+                "days_requested": days_requested,
+                "allowed": not violations,
+                "violations": violations
+            })
+        
+        results.sort(key=lambda result: result["index"])
+        return results
\ No newline at end of file
@@ -0,0 +1,116 @@
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus, invalidation_bus
+
+APPROVER_ROLES = ("manager", "admin")
+
+
+@lru_cache(maxsize=1)
+def get_approval_chain() -> Tuple[str, ...]:
+    """Approver role for each step a leave request goes through, from LEAVE_APPROVAL_CHAIN"""
+    chain = tuple(role.strip().lower() for role in settings.leave_approval_chain)
+    unknown = [role for role in chain if role not in APPROVER_ROLES]
+    if not chain or unknown:
+        raise ValueError(f"Invalid leave approval chain {list(chain)}, roles must be one of {list(APPROVER_ROLES)}")
+    return chain
+
+
+def pending_step(chain: Tuple[str, ...], has_manager: bool, start: int) -> Optional[int]:
+    """First step from start that applies to the requester; None once the chain is complete
+
+    Manager steps are skipped for employees without a manager.
+    """
+    for step in range(start, len(chain)):
+        if chain[step] != "manager" or has_manager:
+            return step
+    return None
+
+
+class OrgHierarchy:
+    """Manager links of the whole org, for walking up or down the reporting lines without queries"""
+
+    def __init__(self, rows: Iterable[Tuple[int, Optional[int]]]):
+        self.manager_of: Dict[int, int] = {}
+        self.reports_of: Dict[int, List[int]] = {}
+        for employee_id, manager_id in rows:
+            if manager_id is not None:
+                self.manager_of[employee_id] = manager_id
+                self.reports_of.setdefault(manager_id, []).append(employee_id)
+
+    def __len__(self) -> int:
+        return len(self.manager_of)
+
+    def managers(self, employee_id: int) -> List[int]:
+        """Managers above an employee, nearest first"""
+        chain = []
+        seen = {employee_id}
+        manager_id = self.manager_of.get(employee_id)
+        while manager_id is not None and manager_id not in seen:
+            chain.append(manager_id)
+            seen.add(manager_id)
+            manager_id = self.manager_of.get(manager_id)
+        return chain
+
+    def is_above(self, manager_id: int, employee_id: int) -> bool:
+        return manager_id in self.managers(employee_id)
+
+    def has_reports(self, employee_id: int) -> bool:
+        return employee_id in self.reports_of
+
+    def team(self, manager_id: int) -> List[int]:
+        """Everyone reporting to a manager, directly or indirectly"""
+        members = []
+        seen = {manager_id}
+        stack = list(self.reports_of.get(manager_id, ()))
+        while stack:
+            employee_id = stack.pop()
+            if employee_id in seen:
+                continue
+            seen.add(employee_id)
+            members.append(employee_id)
+            stack.extend(self.reports_of.get(employee_id, ()))
+        return members
+
+
+class HierarchyCache:
+    """Process-wide hierarchy, rebuilt lazily after invalidation (in any worker) or once it is older than the TTL"""
+
+    def __init__(self, ttl_seconds: float, bus: InvalidationBus = invalidation_bus, channel: str = "org_hierarchy"):
+        self.ttl_seconds = ttl_seconds
+        self.bus = bus
+        self.channel = channel
+        self._hierarchy: Optional[OrgHierarchy] = None
+        self._built_at = 0.0
+        self._generation = -1
+        self._lock = threading.Lock()
+
+    def _fresh(self, hierarchy) -> bool:
+        return (
+            hierarchy is not None
+            and time.monotonic() - self._built_at < self.ttl_seconds
+            and self._generation == self.bus.generation(self.channel)
+        )
+
+    def get(self, load_rows) -> OrgHierarchy:
+        hierarchy = self._hierarchy
+        if self._fresh(hierarchy):
+            return hierarchy
+
+        with self._lock:
+            if not self._fresh(self._hierarchy):
+                generation = self.bus.generation(self.channel)
+                self._hierarchy = OrgHierarchy(load_rows())
+                self._built_at = time.monotonic()
+                self._generation = generation
+            return self._hierarchy
+
+    def invalidate(self) -> None:
+        self._hierarchy = None
+        self.bus.bump(self.channel)
+
+
+hierarchy_cache = HierarchyCache(settings.hierarchy_cache_ttl_seconds)
@@ -0,0 +1,256 @@
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus, invalidation_bus
+
+# id, email, department, is_active, is_admin, joining_date
+SnapshotRow = Tuple[int, str, str, bool, bool, date]
+
+ACTIVE = 1
+ADMIN = 2
+
+
+def email_hash(email: bytes) -> int:
+    return zlib.crc32(email)
+
+
+class Principal:
+    """The fields of an employee that authentication and validation checks read"""
+
+    __slots__ = ("id", "email", "department", "is_active", "is_admin", "joining_date")
+
+    def __init__(self, id: int, email: str, department: str, is_active: bool, is_admin: bool, joining_date: date):
+        self.id = id
+        self.email = email
+        self.department = department
+        self.is_active = is_active
+        self.is_admin = is_admin
+        self.joining_date = joining_date
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id}, email={self.email!r})"
+
+
+class OrgSnapshot:
+    """Every employee's id, email, department, flags and joining date in parallel typed arrays
+
+    Rows are kept in id order, so an id is found by bisection. Emails live in one byte
+    buffer and are found through a sorted array of their CRC32s; departments are interned.
+    That is about 30 bytes per employee plus the email, instead of a full ORM object.
+    """
+
+    def __init__(self, rows: Iterable[SnapshotRow] = ()):
+        self.ids = array("i")
+        self.flags = array("B")
+        self.department_codes = array("H")
+        self.joining_days = array("i")
+        self.email_starts = array("I")
+        self.email_lengths = array("H")
+        self.emails = bytearray()
+        self.email_hashes = array("I")
+        self.email_hash_ids = array("i")
+        self.departments: List[str] = []
+        self._department_index: Dict[str, int] = {}
+
+        hashed = []
+        for employee_id, email, department, is_active, is_admin, joining_date in sorted(rows):
+            encoded = email.encode()
+            self.ids.append(employee_id)
+            self._append_fields(encoded, department, is_active, is_admin, joining_date)
+            hashed.append((email_hash(encoded), employee_id))
+        hashed.sort()
+        self.email_hashes.extend(key for key, _ in hashed)
+        self.email_hash_ids.extend(employee_id for _, employee_id in hashed)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays and the email buffer"""
+        arrays = (
+            self.ids, self.flags, self.department_codes, self.joining_days,
+            self.email_starts, self.email_lengths, self.email_hashes, self.email_hash_ids
+        )
+        return sum(column.itemsize * len(column) for column in arrays) + len(self.emails)
+
+    def copy(self) -> "OrgSnapshot":
+        snapshot = OrgSnapshot()
+        for name in (
+            "ids", "flags", "department_codes", "joining_days", "email_starts",
+            "email_lengths", "emails", "email_hashes", "email_hash_ids"
+        ):
+            setattr(snapshot, name, getattr(self, name)[:])
+        snapshot.departments = list(self.departments)
+        snapshot._department_index = dict(self._department_index)
+        return snapshot
+
+    def _department_code(self, department: str) -> int:
+        code = self._department_index.get(department)
+        if code is None:
+            code = self._department_index[department] = len(self.departments)
+            self.departments.append(department)
+        return code
+
+    def _append_fields(self, email: bytes, department: str, is_active: bool, is_admin: bool, joining_date: date) -> None:
+        self.flags.append((ACTIVE if is_active else 0) | (ADMIN if is_admin else 0))
+        self.department_codes.append(self._department_code(department))
+        self.joining_days.append(joining_date.toordinal())
+        self.email_starts.append(len(self.emails))
+        self.email_lengths.append(len(email))
+        self.emails += email
+
+    def _row(self, employee_id: int) -> int:
+        row = bisect_left(self.ids, employee_id)
+        if row < len(self.ids) and self.ids[row] == employee_id:
+            return row
+        return -1
+
+    def _email(self, row: int) -> bytes:
+        start = self.email_starts[row]
+        return bytes(self.emails[start:start + self.email_lengths[row]])
+
+    def _principal(self, row: int) -> Principal:
+        flags = self.flags[row]
+        return Principal(
+            self.ids[row],
+            self._email(row).decode(),
+            self.departments[self.department_codes[row]],
+            bool(flags & ACTIVE),
+            bool(flags & ADMIN),
+            date.fromordinal(self.joining_days[row])
+        )
+
+    def get(self, employee_id: int) -> Optional[Principal]:
+        row = self._row(employee_id)
+        return self._principal(row) if row >= 0 else None
+
+    def get_by_email(self, email: str) -> Optional[Principal]:
+        encoded = email.encode()
+        key = email_hash(encoded)
+        position = bisect_left(self.email_hashes, key)
+        while position < len(self.email_hashes) and self.email_hashes[position] == key:
+            row = self._row(self.email_hash_ids[position])
+            if row >= 0 and self._email(row) == encoded:
+                return self._principal(row)
+            position += 1
+        return None
+
+    def _index_email(self, email: bytes, employee_id: int) -> None:
+        key = email_hash(email)
+        position = bisect_left(self.email_hashes, key)
+        self.email_hashes.insert(position, key)
+        self.email_hash_ids.insert(position, employee_id)
+
+    def _unindex_email(self, email: bytes, employee_id: int) -> None:
+        key = email_hash(email)
+        position = bisect_left(self.email_hashes, key)
+        while self.email_hashes[position] == key:
+            if self.email_hash_ids[position] == employee_id:
+                del self.email_hashes[position]
+                del self.email_hash_ids[position]
+                return
+            position += 1
+
+    def apply(self, rows: Iterable[SnapshotRow]) -> None:
+        """Insert new employees and overwrite changed ones in place
+
+        The bytes of a replaced email stay in the buffer until the next full load.
+        """
+        for employee_id, email, department, is_active, is_admin, joining_date in rows:
+            encoded = email.encode()
+            row = self._row(employee_id)
+            if row < 0:
+                row = bisect_left(self.ids, employee_id)
+                if row < len(self.ids):
+                    # Out of id order, which autoincrement keys make rare: shift every column
+                    self._append_fields(encoded, department, is_active, is_admin, joining_date)
+                    for column in (
+                        self.flags, self.department_codes, self.joining_days,
+                        self.email_starts, self.email_lengths
+                    ):
+                        column.insert(row, column.pop())
+                else:
+                    self._append_fields(encoded, department, is_active, is_admin, joining_date)
+                self.ids.insert(row, employee_id)
+                self._index_email(encoded, employee_id)
+                continue
+
+            self.flags[row] = (ACTIVE if is_active else 0) | (ADMIN if is_admin else 0)
+            self.department_codes[row] = self._department_code(department)
+            self.joining_days[row] = joining_date.toordinal()
+            previous = self._email(row)
+            if previous != encoded:
+                self._unindex_email(previous, employee_id)
+                self.email_starts[row] = len(self.emails)
+                self.email_lengths[row] = len(encoded)
+                self.emails += encoded
+                self._index_email(encoded, employee_id)
+
+
+class OrgSnapshotCache:
+    """Process-wide snapshot, brought up to date with the rows changed since its last refresh
+
+    It refreshes when any worker signals an employee change on the bus, and at least every
+    refresh_seconds to pick up writes made outside the app. Changes are applied to a copy
+    that then replaces the snapshot, so readers never see one half-updated.
+    """
+
+    def __init__(self, refresh_seconds: float, bus: InvalidationBus = invalidation_bus, channel: str = "org_snapshot"):
+        self.refresh_seconds = refresh_seconds
+        self.bus = bus
+        self.channel = channel
+        self._snapshot: Optional[OrgSnapshot] = None
+        self._watermark = None
+        self._refreshed_at = 0.0
+        self._generation = -1
+        self._lock = threading.Lock()
+
+    def _fresh(self, snapshot) -> bool:
+        return (
+            snapshot is not None
+            and time.monotonic() - self._refreshed_at < self.refresh_seconds
+            and self._generation == self.bus.generation(self.channel)
+        )
+
+    def get(self, load_rows: Callable[[Optional[object]], Tuple[object, List[SnapshotRow]]]) -> OrgSnapshot:
+        """Current snapshot; load_rows(watermark) returns a new watermark and the rows changed since
+        the given one, or every row when it is None"""
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+
+        with self._lock:
+            if not self._fresh(self._snapshot):
+                generation = self.bus.generation(self.channel)
+                if self._snapshot is None:
+                    watermark, rows = load_rows(None)
+                    snapshot = OrgSnapshot(rows)
+                else:
+                    watermark, rows = load_rows(self._watermark)
+                    snapshot = self._snapshot.copy()
+                    snapshot.apply(rows)
+                self._snapshot = snapshot
+                self._watermark = watermark
+                self._refreshed_at = time.monotonic()
+                self._generation = generation
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Have every worker apply the latest employee changes before its next lookup"""
+        self.bus.bump(self.channel)
+
+    def clear(self) -> None:
+        """Drop the snapshot so the next lookup loads every row"""
+        with self._lock:
+            self._snapshot = None
+            self._watermark = None
+
+
+org_snapshot_cache = OrgSnapshotCache(settings.org_snapshot_refresh_seconds)
@@ -0,0 +1,216 @@
+import csv
+import io
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import Integer, case, cast, delete, func, select
+from sqlalchemy.orm import Session
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveRequest, LeaveStatus, LeaveType
+from app.db.models.report import LeaveDailyRollup
+from app.services.leave_policy import business_days
+
+LEAVE_USAGE_COLUMNS = ["year", "month", "department", "leave_type", "days_out", "days_rejected"]
+
+
+def business_dates(start_date: date, end_date: date) -> Iterator[date]:
+    current = start_date
+    while current <= end_date:
+        if current.weekday() < 5:
+            yield current
+        current += timedelta(days=1)
+
+
+class ReportService:
+    """Leave analytics answered from the daily rollup table, never from leave_requests"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_decision(self, leave_request: LeaveRequest, department: str, approved: bool) -> None:
+        """Add a decided request to the rollups; runs inside the caller's transaction"""
+        rows = [
+            {
+                "day": day,
+                "department": department,
+                "leave_type": leave_request.leave_type,
+                "employees_out": 1 if approved else 0,
+                "rejected": 0 if approved else 1
+            }
+            for day in business_dates(leave_request.start_date, leave_request.end_date)
+        ]
+        self._add_to_rollups(rows)
+
+    def _add_to_rollups(self, rows: List[dict]) -> None:
+        if not rows:
+            return
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for row in rows:
+                rollup = self.db.get(LeaveDailyRollup, (row["day"], row["department"], row["leave_type"]))
+                if rollup is None:
+                    self.db.add(LeaveDailyRollup(**row))
+                else:
+                    rollup.employees_out += row["employees_out"]
+                    rollup.rejected += row["rejected"]
+            return
+
+        stmt = insert(LeaveDailyRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LeaveDailyRollup.day, LeaveDailyRollup.department, LeaveDailyRollup.leave_type],
+            set_={
+                "employees_out": LeaveDailyRollup.employees_out + stmt.excluded.employees_out,
+                "rejected": LeaveDailyRollup.rejected + stmt.excluded.rejected
+            }
+        )
+        self.db.execute(stmt)
+
+    def rebuild_rollups(self) -> int:
+        """Recompute every rollup from decided leave requests (one-off backfill)"""
+        counts: Counter = Counter()
+        decided = self.db.execute(
+            select(
+                LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.leave_type,
+                LeaveRequest.status, Employee.department
+            )
+            .join(Employee, Employee.id == LeaveRequest.employee_id)
+            .where(LeaveRequest.status.in_([LeaveStatus.APPROVED, LeaveStatus.REJECTED]))
+        )
+        for start_date, end_date, leave_type, leave_status, department in decided:
+            column = "employees_out" if leave_status == LeaveStatus.APPROVED else "rejected"
+            for day in business_dates(start_date, end_date):
+                counts[(day, department, leave_type, column)] += 1
+
+        rows: Dict[tuple, dict] = {}
+        for (day, department, leave_type, column), count in counts.items():
+            row = rows.setdefault((day, department, leave_type), {
+                "day": day, "department": department, "leave_type": leave_type,
+                "employees_out": 0, "rejected": 0
+            })
+            row[column] = count
+
+        self.db.execute(delete(LeaveDailyRollup))
+        if rows:
+            self.db.bulk_insert_mappings(LeaveDailyRollup, list(rows.values()))
+        self.db.commit()
+        return len(rows)
+
+    def leave_usage(self, year: int, department: Optional[str] = None) -> List[dict]:
+        """Days out and days rejected per month, department and leave type"""
+        month = cast(func.extract("month", LeaveDailyRollup.day), Integer)
+        query = (
+            select(
+                month,
+                LeaveDailyRollup.department,
+                LeaveDailyRollup.leave_type,
+                func.sum(LeaveDailyRollup.employees_out),
+                func.sum(LeaveDailyRollup.rejected)
+            )
+            .where(LeaveDailyRollup.day >= date(year, 1, 1), LeaveDailyRollup.day < date(year + 1, 1, 1))
+            .group_by(month, LeaveDailyRollup.department, LeaveDailyRollup.leave_type)
+            .order_by(month, LeaveDailyRollup.department, LeaveDailyRollup.leave_type)
+        )
+        if department:
+            query = query.where(LeaveDailyRollup.department == department)
+
+        return [
+            {
+                "year": year,
+                "month": int(row_month),
+                "department": row_department,
+                "leave_type": leave_type,
+                "days_out": int(days_out or 0),
+                "days_rejected": int(days_rejected or 0)
+            }
+            for row_month, row_department, leave_type, days_out, days_rejected in self.db.execute(query)
+        ]
+
+    def absenteeism(self, year: int) -> List[dict]:
+        """Share of working days lost to approved leave, per month and department"""
+        month = cast(func.extract("month", LeaveDailyRollup.day), Integer)
+        days_out = self.db.execute(
+            select(month, LeaveDailyRollup.department, func.sum(LeaveDailyRollup.employees_out))
+            .where(LeaveDailyRollup.day >= date(year, 1, 1), LeaveDailyRollup.day < date(year + 1, 1, 1))
+            .group_by(month, LeaveDailyRollup.department)
+        ).all()
+        headcount = dict(self.db.execute(
+            select(Employee.department, func.count(Employee.id))
+            .where(Employee.is_active == True)
+            .group_by(Employee.department)
+        ).all())
+
+        results = []
+        for row_month, department, out in sorted(days_out, key=lambda row: (row[0], row[1])):
+            row_month = int(row_month)
+            first_day = date(year, row_month, 1)
+            next_month = date(year + row_month // 12, row_month % 12 + 1, 1)
+            working_days = business_days(first_day, next_month - timedelta(days=1))
+            staff = headcount.get(department, 0)
+            capacity = staff * working_days
+            results.append({
+                "year": year,
+                "month": row_month,
+                "department": department,
+                "headcount": staff,
+                "working_days": working_days,
+                "days_out": int(out or 0),
+                "absenteeism_rate": round(int(out or 0) / capacity, 4) if capacity else 0.0
+            })
+        return results
+
+    def balance_distribution(self, bucket_size: float = 2.0, by_department: bool = False) -> List[dict]:
+        """Histogram of current leave balances for active employees"""
+        ratio = func.coalesce(Employee.leave_balance, 0) / bucket_size
+        if self.db.get_bind().dialect.name == "sqlite":
+            # SQLite has no floor() and its CAST truncates toward zero, so step negative fractions down
+            truncated = cast(ratio, Integer)
+            bucket = case((ratio < truncated, truncated - 1), else_=truncated)
+        else:
+            # CAST rounds on Postgres, which would put 1.5 in the [2, 4) bucket
+            bucket = cast(func.floor(ratio), Integer)
+        columns = [bucket, func.count(Employee.id)]
+        group_by = [bucket]
+        if by_department:
+            columns.insert(0, Employee.department)
+            group_by.insert(0, Employee.department)
+
+        rows = self.db.execute(
+            select(*columns).where(Employee.is_active == True).group_by(*group_by).order_by(*group_by)
+        ).all()
+
+        results = []
+        for row in rows:
+            department = row[0] if by_department else None
+            index, count = row[-2], row[-1]
+            results.append({
+                "department": department,
+                "lower": index * bucket_size,
+                "upper": (index + 1) * bucket_size,
+                "employees": count
+            })
+        return results
+
+    def leave_usage_csv(self, year: int, department: Optional[str] = None) -> str:
+        """Leave usage as CSV, using pandas when it is installed"""
+        rows = self.leave_usage(year, department)
+        for row in rows:
+            row["leave_type"] = LeaveType(row["leave_type"]).value
+
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+
+        if pd is not None:
+            return pd.DataFrame.from_records(rows, columns=LEAVE_USAGE_COLUMNS).to_csv(index=False)
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=LEAVE_USAGE_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
@@ -27,13 +27,11 @@ async function loadDashboard() {
 
 async function loadDashboardStats() {
     try {
-       
-        const employeesResponse = await apiCall('/employees');
-        if (employeesResponse.ok) {
-            const employees = await employeesResponse.json();
-            dashboardData.totalEmployees = employees.length;
-            document.getElementById('totalEmployees').textContent = employees.length;
-        }
+        const { employees, leaves } = await getSyncedData();
+        
+        const activeEmployees = employees.filter(employee => employee.is_active);
+        dashboardData.totalEmployees = activeEmployees.length;
+        document.getElementById('totalEmployees').textContent = activeEmployees.length;
 
         
         if (currentUser) {
@@ -45,27 +43,20 @@ async function loadDashboardStats() {
             }
         }
 
-       
-        const leavesResponse = await apiCall('/leaves');
-        if (leavesResponse.ok) {
-            const leaves = await leavesResponse.json();
-            
-            
-            const pendingCount = leaves.filter(leave => leave.status === 'pending').length;
-            dashboardData.pendingRequests = pendingCount;
-            document.getElementById('pendingRequests').textContent = pendingCount;
-            
-            
-            const currentMonth = new Date().getMonth();
-            const currentYear = new Date().getFullYear();
-            const thisMonthCount = leaves.filter(leave => {
-                const leaveDate = new Date(leave.start_date);
-                return leaveDate.getMonth() === currentMonth && 
-                       leaveDate.getFullYear() === currentYear;
-            }).length;
-            dashboardData.thisMonthLeaves = thisMonthCount;
-            document.getElementById('thisMonthLeaves').textContent = thisMonthCount;
-        }
+        const pendingCount = leaves.filter(leave => leave.status === 'pending').length;
+        dashboardData.pendingRequests = pendingCount;
+        document.getElementById('pendingRequests').textContent = pendingCount;
+        
+        
+        const currentMonth = new Date().getMonth();
+        const currentYear = new Date().getFullYear();
+        const thisMonthCount = leaves.filter(leave => {
+            const leaveDate = new Date(leave.start_date);
+            return leaveDate.getMonth() === currentMonth && 
+                   leaveDate.getFullYear() === currentYear;
+        }).length;
+        dashboardData.thisMonthLeaves = thisMonthCount;
+        document.getElementById('thisMonthLeaves').textContent = thisMonthCount;
     } catch (error) {
         console.error('Error loading dashboard stats:', error);
     }
@@ -73,11 +64,8 @@ async function loadDashboardStats() {
 
 async function loadRecentLeaves() {
     try {
-        const response = await apiCall('/leaves?limit=5');
-        if (response.ok) {
-            const leaves = await response.json();
-            displayRecentLeaves(leaves);
-        }
+        const { leaves } = await getSyncedData();
+        displayRecentLeaves(leaves.slice(0, 5));
     } catch (error) {
         console.error('Error loading recent leaves:', error);
         document.getElementById('recentLeaves').innerHTML = 
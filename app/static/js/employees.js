@@ -1,6 +1,15 @@
 document.addEventListener('DOMContentLoaded', function() {
     loadEmployees();
 
+    const searchInput = document.getElementById('employeeSearch');
+    if (searchInput) {
+        let searchTimer = null;
+        searchInput.addEventListener('input', function() {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => loadEmployees(this.value.trim()), 150);
+        });
+    }
+
     if (document.getElementById('addEmployeeForm')) {
         document.getElementById('addEmployeeForm').addEventListener('submit', async function(e) {
             e.preventDefault();
@@ -43,14 +52,26 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 
 
-async function loadEmployees() {
+let latestEmployeeQuery = '';
+
+async function loadEmployees(query = '') {
     const tbody = document.querySelector('#employeesTable tbody');
-    tbody.innerHTML = '<tr><td colspan="8" class="text-center"><i class="fas fa-spinner fa-spin"></i> Loading employees...</td></tr>';
+    latestEmployeeQuery = query;
+    if (!query) {
+        tbody.innerHTML = '<tr><td colspan="8" class="text-center"><i class="fas fa-spinner fa-spin"></i> Loading employees...</td></tr>';
+    }
     try {
-        const response = await apiCall('/employees');
+        let response = null;
+        let employees = null;
+        if (query) {
+            response = await apiCall(`/employees/search?q=${encodeURIComponent(query)}&limit=50`);
+        } else {
+            employees = (await getSyncedData()).employees.filter(emp => emp.is_active);
+        }
+        if (query !== latestEmployeeQuery) return;
         tbody.innerHTML = '';
-        if (response.ok) {
-            const employees = await response.json();
+        if (employees || response.ok) {
+            employees = employees || await response.json();
             if (employees.length === 0) {
                 tbody.innerHTML = '<tr><td colspan="8" class="text-center text-muted">No employees</td></tr>';
                 return;
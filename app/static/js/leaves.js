@@ -18,17 +18,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
 async function loadLeaves() {
     try {
-        let endpoint = '/leaves';
-        if (currentUser && !currentUser.is_admin) {
-            endpoint += '/me';
-        }
-        const response = await apiCall(endpoint);
-        if (response.ok) {
-            rawLeavesGlobal = await response.json();
-            filterAndRenderLeavesTable();
-        } else {
-            showErrorRow('Error loading leave requests');
-        }
+        // The sync endpoint already limits non-admins to their own requests
+        const { leaves } = await getSyncedData();
+        rawLeavesGlobal = leaves;
+        filterAndRenderLeavesTable();
     } catch (error) {
         showErrorRow('Network error');
     }
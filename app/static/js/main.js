@@ -7,6 +7,12 @@ document.addEventListener('DOMContentLoaded', function() {
     checkAuth();
 });
 
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js').catch(error => console.warn('Service worker registration failed:', error));
+    });
+}
+
 
 function checkAuth() {
     const token = localStorage.getItem('token');
@@ -73,9 +79,12 @@ function updateUserInfo() {
     }
 }
 
-function logout() {
+async function logout() {
     localStorage.removeItem('token');
     currentUser = null;
+    if (window.clearSyncCache) {
+        await clearSyncCache().catch(() => {});
+    }
     window.location.href = '/login';
 }
 
@@ -0,0 +1,77 @@
+// Served from /sw.js so it controls every page. API data lives in IndexedDB (see sync.js),
+// this worker only keeps the pages and static assets available offline.
+
+const CACHE_NAME = 'lms-shell-v1';
+const PAGES = ['/', '/login', '/dashboard', '/employees', '/leaves'];
+
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => cache.addAll(PAGES))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(names => Promise.all(names.filter(name => name !== CACHE_NAME).map(name => caches.delete(name))))
+            .then(() => self.clients.claim())
+    );
+});
+
+
+async function networkFirst(request) {
+    const cache = await caches.open(CACHE_NAME);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            cache.put(request, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(request);
+        if (cached) {
+            return cached;
+        }
+        throw error;
+    }
+}
+
+// Serve from cache at once and refresh it in the background
+async function staleWhileRevalidate(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+    const refresh = fetch(request).then(response => {
+        // CDN assets loaded without CORS come back opaque, which is still fine to replay
+        if (response.ok || response.type === 'opaque') {
+            cache.put(request, response.clone());
+        }
+        return response;
+    });
+    if (cached) {
+        refresh.catch(() => {});
+        return cached;
+    }
+    return refresh;
+}
+
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+
+    const url = new URL(request.url);
+    if (url.origin === self.location.origin && url.pathname.startsWith('/api/')) {
+        return;
+    }
+
+    if (request.mode === 'navigate') {
+        event.respondWith(networkFirst(request));
+    } else if (url.origin !== self.location.origin || url.pathname.startsWith('/static/')) {
+        event.respondWith(staleWhileRevalidate(request));
+    }
+});
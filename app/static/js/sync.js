@@ -0,0 +1,116 @@
+// Local copy of employees and leave requests, kept current with /sync deltas
+
+const SYNC_DB_NAME = 'lms-cache';
+const SYNC_DB_VERSION = 1;
+let syncDbPromise = null;
+let syncInFlight = null;
+
+
+function openSyncDb() {
+    if (!syncDbPromise) {
+        syncDbPromise = new Promise((resolve, reject) => {
+            const request = indexedDB.open(SYNC_DB_NAME, SYNC_DB_VERSION);
+            request.onupgradeneeded = () => {
+                const db = request.result;
+                db.createObjectStore('employees', { keyPath: 'id' });
+                db.createObjectStore('leaves', { keyPath: 'id' });
+                db.createObjectStore('meta');
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    }
+    return syncDbPromise;
+}
+
+function idbRequest(request) {
+    return new Promise((resolve, reject) => {
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function idbTransactionDone(tx) {
+    return new Promise((resolve, reject) => {
+        tx.oncomplete = () => resolve();
+        tx.onerror = () => reject(tx.error);
+        tx.onabort = () => reject(tx.error);
+    });
+}
+
+async function readCache() {
+    const db = await openSyncDb();
+    const tx = db.transaction(['employees', 'leaves'], 'readonly');
+    const [employees, leaves] = await Promise.all([
+        idbRequest(tx.objectStore('employees').getAll()),
+        idbRequest(tx.objectStore('leaves').getAll())
+    ]);
+    return { employees, leaves };
+}
+
+async function clearSyncCache() {
+    const db = await openSyncDb();
+    const tx = db.transaction(['employees', 'leaves', 'meta'], 'readwrite');
+    ['employees', 'leaves', 'meta'].forEach(name => tx.objectStore(name).clear());
+    await idbTransactionDone(tx);
+}
+
+
+async function pullChanges() {
+    const db = await openSyncDb();
+    const meta = db.transaction('meta', 'readonly').objectStore('meta');
+    const [syncToken, syncedFor] = await Promise.all([
+        idbRequest(meta.get('token')),
+        idbRequest(meta.get('authToken'))
+    ]);
+
+    // A different login may see different rows, so start over instead of applying a delta
+    const authToken = localStorage.getItem('token');
+    const resume = syncToken && syncedFor === authToken;
+    if (!resume) {
+        await clearSyncCache();
+    }
+
+    const response = await apiCall(resume ? `/sync?since=${encodeURIComponent(syncToken)}` : '/sync');
+    if (!response.ok) {
+        throw new Error(`Sync failed with ${response.status}`);
+    }
+    const changes = await response.json();
+
+    const tx = db.transaction(['employees', 'leaves', 'meta'], 'readwrite');
+    changes.employees.forEach(employee => tx.objectStore('employees').put(employee));
+    changes.leave_requests.forEach(leave => tx.objectStore('leaves').put(leave));
+    tx.objectStore('meta').put(changes.token, 'token');
+    tx.objectStore('meta').put(authToken, 'authToken');
+    await idbTransactionDone(tx);
+}
+
+
+// Apply the server's changes and return every cached row; falls back to the cache when offline
+async function getSyncedData() {
+    if (!window.indexedDB) {
+        const [employeesResponse, leavesResponse] = await Promise.all([
+            apiCall('/employees'),
+            apiCall(currentUser && !currentUser.is_admin ? '/leaves/me' : '/leaves')
+        ]);
+        return { employees: await employeesResponse.json(), leaves: await leavesResponse.json() };
+    }
+
+    if (!syncInFlight) {
+        syncInFlight = pullChanges().finally(() => { syncInFlight = null; });
+    }
+    try {
+        await syncInFlight;
+    } catch (error) {
+        console.warn('Sync failed, showing cached data:', error);
+    }
+
+    const data = await readCache();
+    data.employees.sort((a, b) => a.id - b.id);
+    data.leaves.sort((a, b) => a.id - b.id);
+    return data;
+}
+
+
+window.getSyncedData = getSyncedData;
+window.clearSyncCache = clearSyncCache;
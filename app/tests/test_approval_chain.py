@@ -0,0 +1,123 @@
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveApproval, LeaveStatus, LeaveType
+from app.schemas.employee import EmployeeUpdate
+from app.schemas.leave import LeaveRequestCreate
+from app.services.employee_service import EmployeeService
+from app.services.leave_service import LeaveService
+from app.services.org_hierarchy import get_approval_chain, hierarchy_cache
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "leave_approval_chain", ["manager", "admin"])
+    get_approval_chain.cache_clear()
+    hierarchy_cache.invalidate()
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'approvals.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+    get_approval_chain.cache_clear()
+    hierarchy_cache.invalidate()
+
+
+def add_employee(db, name, manager=None, is_admin=False):
+    employee = Employee(
+        name=name,
+        email=f"{name.lower()}@company.com",
+        department="Engineering",
+        joining_date=date(2024, 1, 1),
+        leave_balance=20.0,
+        is_admin=is_admin,
+        manager_id=manager.id if manager else None
+    )
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def submit(db, employee):
+    return LeaveService(db).create_leave_request(LeaveRequestCreate(
+        employee_id=employee.id,
+        start_date=date(2024, 9, 2),
+        end_date=date(2024, 9, 3),
+        leave_type=LeaveType.VACATION
+    ))
+
+
+def test_request_goes_through_manager_then_admin(db):
+    admin = add_employee(db, "Admin", is_admin=True)
+    director = add_employee(db, "Director")
+    manager = add_employee(db, "Manager", manager=director)
+    engineer = add_employee(db, "Engineer", manager=manager)
+    peer = add_employee(db, "Peer", manager=director)
+    leave = submit(db, engineer)
+    service = LeaveService(db)
+
+    assert leave.approval_step == 0
+    assert [r.id for r in service.get_pending_approvals(manager)] == [leave.id]
+    assert [r.id for r in service.get_pending_approvals(director)] == [leave.id]
+    assert service.get_pending_approvals(admin) == []
+    assert service.get_pending_approvals(engineer) == []
+
+    with pytest.raises(HTTPException) as denied:
+        service.approve_leave_request(leave.id, approver=peer)
+    assert denied.value.status_code == 403
+
+    leave = service.approve_leave_request(leave.id, "Fine by me", approver=manager)
+    assert (leave.status, leave.approval_step) == (LeaveStatus.PENDING, 1)
+    assert service.get_pending_approvals(manager) == []
+    assert [r.id for r in service.get_pending_approvals(admin)] == [leave.id]
+
+    with pytest.raises(HTTPException) as denied:
+        service.approve_leave_request(leave.id, approver=director)
+    assert denied.value.status_code == 403
+
+    leave = service.approve_leave_request(leave.id, approver=admin)
+    assert leave.status == LeaveStatus.APPROVED
+    assert db.get(Employee, engineer.id).leave_balance == 18.0
+    steps = db.query(LeaveApproval).order_by(LeaveApproval.step).all()
+    assert [(s.step, s.role, s.approver_id) for s in steps] == [(0, "manager", manager.id), (1, "admin", admin.id)]
+
+
+def test_manager_step_is_skipped_without_a_manager(db):
+    admin = add_employee(db, "Admin", is_admin=True)
+    loner = add_employee(db, "Loner")
+    leave = submit(db, loner)
+
+    assert leave.approval_step == 1
+    assert [r.id for r in LeaveService(db).get_pending_approvals(admin)] == [leave.id]
+
+
+def test_manager_can_reject_and_end_the_chain(db):
+    manager = add_employee(db, "Manager")
+    engineer = add_employee(db, "Engineer", manager=manager)
+    leave = submit(db, engineer)
+
+    leave = LeaveService(db).reject_leave_request(leave.id, "Release week", approver=manager)
+    assert leave.status == LeaveStatus.REJECTED
+    assert db.query(LeaveApproval).one().decision == LeaveStatus.REJECTED
+
+
+def test_reporting_cycles_are_rejected(db):
+    director = add_employee(db, "Director")
+    manager = add_employee(db, "Manager", manager=director)
+    engineer = add_employee(db, "Engineer", manager=manager)
+    service = EmployeeService(db)
+
+    with pytest.raises(HTTPException) as cycle:
+        service.update_employee(director.id, EmployeeUpdate(manager_id=engineer.id))
+    assert cycle.value.status_code == 400
+
+    assert service.get_hierarchy().is_above(director.id, engineer.id)
+    service.update_employee(engineer.id, EmployeeUpdate(manager_id=director.id))
+    assert service.get_hierarchy().managers(engineer.id) == [director.id]
@@ -0,0 +1,158 @@
+import os
+import threading
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveRequest, LeaveStatus, LeaveType
+from app.db.models.report import LeaveDailyRollup
+from app.services.leave_service import LeaveService
+
+DB_PATH = "./test_concurrency.db"
+engine = create_engine(
+    f"sqlite:///{DB_PATH}",
+    connect_args={"check_same_thread": False, "timeout": 5}
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def seeded():
+    """Two employees with one pending two-day vacation request each"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    employees = [
+        Employee(
+            name=f"Concurrent Employee {n}",
+            email=f"concurrent{n}@company.com",
+            department="Operations",
+            joining_date=date(2024, 1, 1),
+            leave_balance=20.0
+        )
+        for n in range(2)
+    ]
+    db.add_all(employees)
+    db.flush()
+    leaves = [
+        LeaveRequest(
+            employee_id=employee.id,
+            start_date=date(2024, 7, 1),
+            end_date=date(2024, 7, 2),
+            leave_type=LeaveType.VACATION,
+            days_requested=2
+        )
+        for employee in employees
+    ]
+    db.add_all(leaves)
+    db.commit()
+    ids = [(leave.employee_id, leave.id) for leave in leaves]
+    db.close()
+    yield ids
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+
+def test_stale_approval_is_rejected_with_conflict(seeded):
+    employee_id, leave_id = seeded[0]
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        # Both admins load the pending request before either acts; keep the
+        # reference so the second session approves its stale copy
+        stale = LeaveService(second).get_leave_request(leave_id)
+        LeaveService(first).approve_leave_request(leave_id)
+
+        with pytest.raises(HTTPException) as exc_info:
+            LeaveService(second).approve_leave_request(leave_id)
+        assert exc_info.value.status_code == 409
+        assert stale.status == LeaveStatus.APPROVED
+    finally:
+        first.close()
+        second.close()
+
+    db = SessionLocal()
+    assert db.get(Employee, employee_id).leave_balance == 18.0
+    assert db.get(LeaveRequest, leave_id).version == 2
+    db.close()
+
+
+def test_if_match_mismatch_is_rejected(seeded):
+    _, leave_id = seeded[0]
+    db = SessionLocal()
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            LeaveService(db).approve_leave_request(leave_id, expected_version=7)
+        assert exc_info.value.status_code == 412
+        assert LeaveService(db).approve_leave_request(leave_id, expected_version=1).version == 2
+    finally:
+        db.close()
+
+
+def test_no_double_approvals_under_parallel_load(seeded):
+    workers_per_leave = 3
+    barrier = threading.Barrier(workers_per_leave * len(seeded))
+    outcomes = []
+    lock = threading.Lock()
+
+    def approve(leave_id):
+        db = SessionLocal()
+        try:
+            service = LeaveService(db)
+            loaded = service.get_leave_request(leave_id)
+            barrier.wait(timeout=10)
+            service.approve_leave_request(leave_id)
+            result = (leave_id, 200 if loaded.status == LeaveStatus.APPROVED else "not approved")
+        except HTTPException as e:
+            result = (leave_id, e.status_code)
+        except Exception as e:
+            result = (leave_id, type(e).__name__)
+        finally:
+            db.close()
+        with lock:
+            outcomes.append(result)
+
+    threads = [
+        threading.Thread(target=approve, args=(leave_id,), daemon=True)
+        for _, leave_id in seeded
+        for _ in range(workers_per_leave)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=20)
+    assert not any(thread.is_alive() for thread in threads)
+
+    for _, leave_id in seeded:
+        statuses = sorted((code for lid, code in outcomes if lid == leave_id), key=str)
+        assert statuses == [200] + [409] * (workers_per_leave - 1)
+
+    db = SessionLocal()
+    try:
+        approved = db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.APPROVED).count()
+        assert approved == len(seeded)
+        for employee_id, _ in seeded:
+            assert db.get(Employee, employee_id).leave_balance == 18.0
+        assert (db.query(func.sum(LeaveDailyRollup.employees_out)).scalar() or 0) == 2 * approved
+    finally:
+        db.close()
+
+
+def test_upgrade_schema_adds_version_columns(tmp_path):
+    from sqlalchemy import inspect, text
+    from app.db.upgrade import upgrade_schema
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as connection:
+        connection.execute(text("CREATE TABLE employees (id INTEGER PRIMARY KEY, name VARCHAR(100))"))
+        connection.execute(text("INSERT INTO employees (id, name) VALUES (1, 'Existing')"))
+
+    assert upgrade_schema(legacy) == ["employees.version", "employees.manager_id", "ix_employees_manager_id"]
+    assert upgrade_schema(legacy) == []
+    assert "version" in {column["name"] for column in inspect(legacy).get_columns("employees")}
+    with legacy.connect() as connection:
+        assert connection.execute(text("SELECT version FROM employees")).scalar() == 1
+    legacy.dispose()
@@ -0,0 +1,106 @@
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveStatus, LeaveType
+from app.schemas.leave import LeaveRequestCreate
+from app.services.coverage import daily_absences
+from app.services.leave_service import LeaveService
+from app.services.org_hierarchy import get_approval_chain
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "leave_approval_chain", ["admin"])
+    get_approval_chain.cache_clear()
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'coverage.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+    get_approval_chain.cache_clear()
+
+
+def add_employee(db, name, department="Engineering"):
+    employee = Employee(
+        name=name,
+        email=f"{name.lower()}@company.com",
+        department=department,
+        joining_date=date(2024, 1, 1),
+        leave_balance=20.0
+    )
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def submit(db, employee, start_date, end_date):
+    return LeaveService(db).create_leave_request(LeaveRequestCreate(
+        employee_id=employee.id,
+        start_date=start_date,
+        end_date=end_date,
+        leave_type=LeaveType.VACATION
+    ))
+
+
+def test_sweep_counts_weekdays_in_the_window():
+    days = daily_absences(
+        [
+            (date(2024, 8, 28), date(2024, 9, 3), True),
+            (date(2024, 9, 3), date(2024, 9, 4), False),
+            (date(2024, 9, 10), date(2024, 9, 12), True),
+        ],
+        date(2024, 9, 2),
+        date(2024, 9, 9)
+    )
+
+    assert days == [
+        (date(2024, 9, 2), 1, 0),
+        (date(2024, 9, 3), 1, 1),
+        (date(2024, 9, 4), 0, 1),
+        (date(2024, 9, 5), 0, 0),
+        (date(2024, 9, 6), 0, 0),
+        (date(2024, 9, 9), 0, 0),
+    ]
+
+
+def test_coverage_counts_only_the_same_department(db):
+    ada, grace, linus = add_employee(db, "Ada"), add_employee(db, "Grace"), add_employee(db, "Linus")
+    add_employee(db, "Margaret", department="Finance")
+    service = LeaveService(db)
+
+    service.approve_leave_request(submit(db, grace, date(2024, 9, 2), date(2024, 9, 3)).id)
+    submit(db, linus, date(2024, 9, 3), date(2024, 9, 4))
+    coverage = service.get_coverage(submit(db, ada, date(2024, 9, 2), date(2024, 9, 4)))
+
+    assert coverage["department"] == "Engineering"
+    assert [(day["day"].day, day["approved_out"], day["pending_out"], day["available"]) for day in coverage["days"]] == [
+        (2, 1, 0, 1),
+        (3, 1, 1, 1),
+        (4, 0, 1, 2),
+    ]
+    assert {day["headcount"] for day in coverage["days"]} == {3}
+
+
+def test_minimum_staffing_blocks_final_approval(db, monkeypatch):
+    ada, grace = add_employee(db, "Ada"), add_employee(db, "Grace")
+    add_employee(db, "Linus")
+    service = LeaveService(db)
+    service.approve_leave_request(submit(db, grace, date(2024, 9, 2), date(2024, 9, 3)).id)
+    leave_request = submit(db, ada, date(2024, 9, 3), date(2024, 9, 5))
+
+    monkeypatch.setattr(settings, "department_min_staffing", 2)
+    with pytest.raises(HTTPException) as error:
+        service.approve_leave_request(leave_request.id)
+    assert error.value.status_code == 400
+    assert "2024-09-03" in error.value.detail
+    db.rollback()
+
+    monkeypatch.setattr(settings, "department_min_staffing", 1)
+    assert service.approve_leave_request(leave_request.id).status == LeaveStatus.APPROVED
@@ -0,0 +1,57 @@
+import multiprocessing
+from app.core.invalidation import InvalidationBus
+from app.services.employee_search import SearchIndexCache
+from app.services.org_hierarchy import HierarchyCache
+
+
+def _bump(path):
+    InvalidationBus(path).bump("search_index")
+
+
+def test_generations_are_shared_through_the_file(tmp_path):
+    path = str(tmp_path / "bus")
+    first, second = InvalidationBus(path), InvalidationBus(path)
+
+    assert first.generation("search_index") == 0
+    assert second.bump("search_index") == 1
+    assert first.generation("search_index") == 1
+    assert first.generation("org_hierarchy") == 0
+
+    process = multiprocessing.get_context("fork").Process(target=_bump, args=(path,))
+    process.start()
+    process.join()
+    assert first.generation("search_index") == 2
+    first.close()
+    second.close()
+
+
+def test_invalidation_in_one_worker_rebuilds_cache_in_another(tmp_path):
+    path = str(tmp_path / "bus")
+    loads = []
+
+    def load_rows():
+        loads.append(1)
+        return [(1, "Ada Lovelace", "ada@company.com", "Engineering")]
+
+    worker_a = SearchIndexCache(3600, bus=InvalidationBus(path))
+    worker_b = SearchIndexCache(3600, bus=InvalidationBus(path))
+    worker_a.get(load_rows)
+    worker_b.get(load_rows)
+    worker_b.get(load_rows)
+    assert len(loads) == 2
+
+    worker_b.invalidate()
+    assert worker_a.get(load_rows).search("ada") == [1]
+    assert len(loads) == 3
+
+
+def test_hierarchy_cache_follows_the_bus(tmp_path):
+    bus = InvalidationBus(str(tmp_path / "bus"))
+    cache = HierarchyCache(3600, bus=bus)
+    links = [(2, 1)]
+
+    assert cache.get(lambda: links).managers(2) == [1]
+    links = [(2, 3)]
+    assert cache.get(lambda: links).managers(2) == [1]
+    bus.bump("org_hierarchy")
+    assert cache.get(lambda: links).managers(2) == [3]
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import date
+from functools import partial
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveRequest, LeaveType
+from app.schemas.leave import LeaveRequestCreate
+from app.services.leave_batcher import LeaveSubmissionBatcher
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'batcher.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    db.add_all([
+        Employee(
+            name=f"Planner {n}",
+            email=f"planner{n}@company.com",
+            department="Planning",
+            joining_date=date(2024, 1, 1),
+            leave_balance=20.0
+        )
+        for n in range(3)
+    ])
+    db.commit()
+    db.close()
+    yield partial(SessionLocal, expire_on_commit=False)
+    engine.dispose()
+
+
+def submission(employee_id, start_day, end_day):
+    return LeaveRequestCreate(
+        employee_id=employee_id,
+        start_date=date(2024, 9, start_day),
+        end_date=date(2024, 9, end_day),
+        leave_type=LeaveType.VACATION
+    )
+
+
+def test_concurrent_submissions_share_one_commit(session_factory):
+    submissions = [
+        submission(1, 2, 3),
+        submission(2, 2, 6),
+        submission(1, 3, 4),    # overlaps the first one, accepted earlier in the same batch
+        submission(3, 9, 10),
+        submission(99, 2, 3),   # unknown employee
+        submission(1, 16, 17),
+    ]
+
+    async def run():
+        batcher = LeaveSubmissionBatcher(session_factory, max_batch=100, max_wait_ms=50)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(item) for item in submissions),
+                return_exceptions=True
+            ), batcher.batches
+        finally:
+            await batcher.stop()
+
+    results, batches = asyncio.run(run())
+
+    assert batches == 1
+    assert [getattr(result, "status_code", 201) for result in results] == [201, 201, 400, 201, 404, 201]
+    assert results[2].detail == "Overlapping leave request exists"
+    assert results[1].days_requested == 5
+    assert len({result.id for result in results if not isinstance(result, HTTPException)}) == 4
+
+    db = session_factory()
+    assert db.query(LeaveRequest).count() == 4
+    db.close()
+
+
+def test_batches_are_capped_by_size(session_factory):
+    async def run():
+        batcher = LeaveSubmissionBatcher(session_factory, max_batch=2, max_wait_ms=50)
+        batcher.start()
+        try:
+            await asyncio.gather(*(batcher.submit(submission(1, day, day + 1)) for day in (2, 9, 16, 23)))
+            return batcher.batches
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == 2
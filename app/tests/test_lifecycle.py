@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from app.core.lifecycle import DrainMiddleware, Lifecycle, warm_up_connections
+
+
+def make_app(state, release):
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return {}
+
+    @app.get("/livez")
+    async def livez():
+        return {}
+
+    @app.get("/items")
+    async def items():
+        return []
+
+    app.add_middleware(DrainMiddleware, state=state)
+    return app
+
+
+def test_drain_waits_for_in_flight_requests_and_refuses_new_ones():
+    state = Lifecycle()
+    release = threading.Event()
+    client = TestClient(make_app(state, release))
+
+    slow = threading.Thread(target=lambda: client.get("/slow"), daemon=True)
+    slow.start()
+    deadline = time.monotonic() + 5
+    while state.in_flight == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert state.in_flight == 1
+
+    async def drain():
+        task = asyncio.create_task(state.drain(deadline_seconds=5))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        assert client.get("/items").status_code == 503
+        assert client.get("/livez").status_code == 200
+        release.set()
+        return await task
+
+    assert asyncio.run(drain()) is True
+    slow.join(timeout=5)
+    assert state.in_flight == 0
+
+
+def test_drain_gives_up_at_the_deadline():
+    state = Lifecycle()
+    state.in_flight = 1
+    assert asyncio.run(state.drain(deadline_seconds=0.1)) is False
+    assert state.draining
+
+
+def test_warm_up_opens_pool_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", pool_size=3)
+    assert warm_up_connections(engine) == 3
+    assert engine.pool.checkedin() == 3
+    engine.dispose()
@@ -5,6 +5,7 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.db.session import get_db, Base
 from app.core.config import settings
+from app.core.rate_limit import rate_limit_backend
 
 # Test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -23,6 +24,7 @@ app.dependency_overrides[get_db] = override_get_db
 @pytest.fixture
 def client():
     Base.metadata.create_all(bind=engine)
+    rate_limit_backend.reset()
     with TestClient(app) as client:
         yield client
     Base.metadata.drop_all(bind=engine)
@@ -32,6 +34,22 @@ def test_health_check(client):
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
+def test_liveness_and_readiness_probes(client):
+    assert client.get("/livez").json() == {"status": "alive"}
+
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ready",
+        "checks": {
+            "database": True,
+            "draining": False,
+            "warm_connections": True,
+            "warm_queries": True,
+            "warm_templates": True
+        }
+    }
+
 def test_create_employee(client):
     # First login as admin
     login_response = client.post("/api/v1/auth/login", json={
@@ -91,4 +109,430 @@ def test_apply_leave(client):
     assert response.status_code == 201
     data = response.json()
     assert data["leave_type"] == leave_data["leave_type"]
-    assert data["status"] == "pending"
\ No newline at end of file
+    assert data["status"] == "pending"
+
+def test_idempotent_leave_submission(client):
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": settings.default_admin_email,
+        "password": settings.default_admin_password
+    })
+    token = login_response.json()["access_token"]
+    user = client.get(
+        "/api/v1/employees/me",
+        headers={"Authorization": f"Bearer {token}"}
+    ).json()
+
+    leave_data = {
+        "employee_id": user["id"],
+        "start_date": "2024-11-04",
+        "end_date": "2024-11-05",
+        "leave_type": "personal"
+    }
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "submit-leave-1"}
+
+    first = client.post("/api/v1/leaves/", json=leave_data, headers=headers)
+    retry = client.post("/api/v1/leaves/", json=leave_data, headers=headers)
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    leaves = client.get("/api/v1/leaves/", headers={"Authorization": f"Bearer {token}"}).json()
+    assert len(leaves) == 1
+
+    leave_data["reason"] = "changed"
+    mismatch = client.post("/api/v1/leaves/", json=leave_data, headers=headers)
+    assert mismatch.status_code == 422
+
+def test_etag_chains_if_match_through_approval(client):
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": settings.default_admin_email,
+        "password": settings.default_admin_password
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    user = client.get("/api/v1/employees/me", headers=headers).json()
+
+    leave = client.post("/api/v1/leaves/", json={
+        "employee_id": user["id"],
+        "start_date": "2024-10-07",
+        "end_date": "2024-10-08",
+        "leave_type": "personal"
+    }, headers=headers).json()
+
+    etag = client.get(f"/api/v1/leaves/{leave['id']}", headers=headers).headers["ETag"]
+    assert etag == '"1"'
+
+    preview = client.get(f"/api/v1/leaves/{leave['id']}/coverage", headers=headers).json()
+    assert [day["day"] for day in preview["days"]] == ["2024-10-07", "2024-10-08"]
+
+    stale = client.post(
+        f"/api/v1/leaves/{leave['id']}/reject",
+        json={},
+        headers={**headers, "If-Match": '"7"'}
+    )
+    assert stale.status_code == 412
+
+    approved = client.post(
+        f"/api/v1/leaves/{leave['id']}/approve",
+        json={},
+        headers={**headers, "If-Match": etag, "Idempotency-Key": "approve-etag-1"}
+    )
+    assert approved.status_code == 200
+    assert approved.headers["ETag"] == '"2"'
+    assert approved.json()["coverage"]["days"] == preview["days"]
+
+    replay = client.post(
+        f"/api/v1/leaves/{leave['id']}/approve",
+        json={},
+        headers={**headers, "If-Match": etag, "Idempotency-Key": "approve-etag-1"}
+    )
+    assert replay.headers["ETag"] == '"2"'
+
+def test_static_assets_served_precompressed(tmp_path):
+    from fastapi import FastAPI
+    from app.core.static_files import PrecompressedStaticFiles, compress_static
+
+    (tmp_path / "app.js").write_text("console.log('leave');\n" * 200)
+    assert compress_static(str(tmp_path)) == [str(tmp_path / "app.js.gz")]
+
+    static_app = FastAPI()
+    static_app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)), name="static")
+    static_client = TestClient(static_app)
+
+    response = static_client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript") or \
+        response.headers["content-type"].startswith("application/javascript")
+    assert response.text.startswith("console.log")
+
+    plain = static_client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+def test_large_responses_are_gzipped(client):
+    response = client.get("/static/js/main.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+def test_leave_policy_what_if_evaluation(client, tmp_path, monkeypatch):
+    import json
+    from app.services.leave_policy import reload_leave_policies
+
+    policy_file = tmp_path / "leave_policy.json"
+    policy_file.write_text(json.dumps({
+        "types": {
+            "sick": {"uses_balance": False, "annual_quota": 3},
+            "vacation": {
+                "max_consecutive_days": 10,
+                "blackout_periods": [{"start_date": "2024-12-23", "end_date": "2024-12-31"}]
+            }
+        }
+    }))
+    monkeypatch.setattr(settings, "leave_policy_file", str(policy_file))
+    reload_leave_policies()
+
+    try:
+        login_response = client.post("/api/v1/auth/login", json={
+            "email": settings.default_admin_email,
+            "password": settings.default_admin_password
+        })
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+        user = client.get("/api/v1/employees/me", headers=headers).json()
+
+        response = client.post("/api/v1/leaves/policy/evaluate", json={
+            "employee_id": user["id"],
+            "requests": [
+                {"start_date": "2024-03-04", "end_date": "2024-03-05", "leave_type": "sick"},
+                {"start_date": "2024-04-01", "end_date": "2024-04-02", "leave_type": "sick"},
+                {"start_date": "2024-12-27", "end_date": "2024-12-30", "leave_type": "vacation"},
+                {"start_date": "2024-03-05", "end_date": "2024-03-06", "leave_type": "personal"}
+            ]
+        }, headers=headers)
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["allowed"] for r in results] == [True, False, False, False]
+        assert results[1]["violations"][0].startswith("Annual sick leave quota exceeded")
+        assert "not allowed between 2024-12-23 and 2024-12-31" in results[2]["violations"][0]
+        assert results[3]["violations"] == ["Overlapping leave request exists"]
+    finally:
+        monkeypatch.undo()
+        reload_leave_policies()
+
+def test_monthly_accrual_is_chunked_and_idempotent(client):
+    from datetime import date
+    from app.db.models.accrual import AccrualRun
+    from app.db.models.employee import Employee as EmployeeModel
+    from app.services.accrual_service import AccrualService
+
+    db = TestingSessionLocal()
+    try:
+        for i in range(5):
+            db.add(EmployeeModel(
+                name=f"Employee {i}",
+                email=f"accrual{i}@company.com",
+                department="Engineering",
+                joining_date=date(2024, 1, 1),
+                leave_balance=2.0
+            ))
+        db.add(EmployeeModel(
+            name="Future Hire",
+            email="future@company.com",
+            department="Engineering",
+            joining_date=date(2024, 6, 1),
+            leave_balance=0.0
+        ))
+        db.commit()
+
+        progress = []
+        run = AccrualService(db, chunk_size=2).run_monthly_accrual("2024-03", progress=progress.append)
+        assert run.status == "completed"
+        assert run.processed == 6  # five employees plus the default admin
+        assert len(progress) == 5
+
+        AccrualService(db, chunk_size=2).run_monthly_accrual("2024-03")
+        balances = {e.email: e.leave_balance for e in db.query(EmployeeModel).all()}
+        assert balances["accrual0@company.com"] == 2.0 + settings.accrual_days_per_month
+        assert balances["future@company.com"] == 0.0
+        assert db.query(AccrualRun).count() == 1
+
+        db.query(EmployeeModel).update({EmployeeModel.leave_balance: 12.0})
+        db.commit()
+        rollover = AccrualService(db, chunk_size=4).run_year_end_rollover(2024)
+        assert rollover.status == "completed"
+        capped = db.query(EmployeeModel).filter(EmployeeModel.email == "accrual1@company.com").first()
+        assert capped.leave_balance == settings.rollover_carry_forward_days + settings.rollover_annual_grant_days
+    finally:
+        db.close()
+
+def test_accrual_stops_when_its_lease_is_taken_over(client):
+    from datetime import date, datetime, timedelta
+    from sqlalchemy import update
+    from app.db.models.accrual import AccrualRun
+    from app.db.models.employee import Employee as EmployeeModel
+    from app.services.accrual_service import AccrualService
+
+    db = TestingSessionLocal()
+    other = TestingSessionLocal()
+    try:
+        for i in range(5):
+            db.add(EmployeeModel(
+                name=f"Employee {i}", email=f"lease{i}@company.com", department="Engineering",
+                joining_date=date(2024, 1, 1), leave_balance=0.0
+            ))
+        db.commit()
+
+        def take_over(run):
+            other.execute(update(AccrualRun).values(locked_until=datetime.utcnow() + timedelta(hours=1)))
+            other.commit()
+
+        run = AccrualService(db, chunk_size=2).run_monthly_accrual("2024-03", progress=take_over)
+        assert run.status == "running"
+        assert run.processed == 2
+        credited = db.query(EmployeeModel).filter(EmployeeModel.leave_balance > 0).count()
+        assert credited == 2
+    finally:
+        other.close()
+        db.close()
+
+def test_due_jobs_catch_up_in_arrears(client):
+    from datetime import date
+    from app.db.models.accrual import AccrualRun
+    from app.services.accrual_service import AccrualService
+
+    db = TestingSessionLocal()
+    try:
+        AccrualService(db).run_due_jobs(today=date(2025, 1, 2))
+        AccrualService(db).run_due_jobs(today=date(2025, 3, 10))
+        runs = [(run.job, run.period, run.status) for run in db.query(AccrualRun).order_by(AccrualRun.id)]
+        assert runs == [
+            ("accrual", "2024-12", "completed"),
+            ("rollover", "2024", "completed"),
+            ("accrual", "2025-02", "completed"),
+        ]
+
+        db.query(AccrualRun).filter(AccrualRun.job == "rollover").delete()
+        db.commit()
+        AccrualService(db).run_due_jobs(today=date(2025, 4, 1))
+        assert db.query(AccrualRun).filter(AccrualRun.job == "rollover", AccrualRun.period == "2024").one().status == "completed"
+    finally:
+        db.close()
+
+def test_search_employees(client):
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": settings.default_admin_email,
+        "password": settings.default_admin_password
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    for name, email, department in [
+        ("Priya Sharma", "priya@company.com", "Engineering"),
+        ("Priyanka Rao", "prao@company.com", "Finance"),
+        ("Rahul Verma", "rahul@company.com", "Engineering"),
+    ]:
+        client.post("/api/v1/employees/", json={
+            "name": name, "email": email, "department": department, "joining_date": "2024-01-01"
+        }, headers=headers)
+
+    def search(q):
+        response = client.get("/api/v1/employees/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200
+        return [e["name"] for e in response.json()]
+
+    assert search("priy") == ["Priya Sharma", "Priyanka Rao"]
+    assert search("priya") == ["Priya Sharma", "Priyanka Rao"]
+    assert search("eng rah") == ["Rahul Verma"]
+    assert search("finnance") == ["Priyanka Rao"]
+    assert search("zzz") == []
+
+def test_reports_served_from_rollups(client):
+    from sqlalchemy import event
+
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": settings.default_admin_email,
+        "password": settings.default_admin_password
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    user = client.get("/api/v1/employees/me", headers=headers).json()
+
+    approved = client.post("/api/v1/leaves/", json={
+        "employee_id": user["id"], "start_date": "2024-05-06", "end_date": "2024-05-08", "leave_type": "vacation"
+    }, headers=headers).json()
+    rejected = client.post("/api/v1/leaves/", json={
+        "employee_id": user["id"], "start_date": "2024-06-03", "end_date": "2024-06-04", "leave_type": "sick"
+    }, headers=headers).json()
+    client.post(f"/api/v1/leaves/{approved['id']}/approve", json={}, headers=headers)
+    client.post(f"/api/v1/leaves/{rejected['id']}/reject", json={}, headers=headers)
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        usage = client.get("/api/v1/reports/leave-usage", params={"year": 2024}, headers=headers).json()
+        csv_export = client.get("/api/v1/reports/leave-usage.csv", params={"year": 2024}, headers=headers)
+        absenteeism = client.get("/api/v1/reports/absenteeism", params={"year": 2024}, headers=headers).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert not any("leave_requests" in statement for statement in statements)
+    assert usage == [
+        {"year": 2024, "month": 5, "department": "IT", "leave_type": "vacation", "days_out": 3, "days_rejected": 0},
+        {"year": 2024, "month": 6, "department": "IT", "leave_type": "sick", "days_out": 0, "days_rejected": 2},
+    ]
+    assert csv_export.text.splitlines()[1] == "2024,5,IT,vacation,3,0"
+    assert absenteeism[0]["days_out"] == 3 and absenteeism[0]["working_days"] == 23
+
+    distribution = client.get("/api/v1/reports/balance-distribution", headers=headers).json()
+    assert distribution == [{"department": None, "lower": 4.0, "upper": 6.0, "employees": 1}]
+
+def test_balance_distribution_floors_negative_balances(client):
+    from datetime import date
+    from app.db.models.employee import Employee as EmployeeModel
+    from app.services.report_service import ReportService
+
+    db = TestingSessionLocal()
+    for i, balance in enumerate([-0.5, -2.5, 1.5, 3.0, -2.0]):
+        db.add(EmployeeModel(
+            name=f"Balance {i}", email=f"balance{i}@company.com", department="Balances",
+            joining_date=date(2024, 1, 1), leave_balance=balance
+        ))
+    db.commit()
+
+    distribution = [
+        (row["lower"], row["employees"])
+        for row in ReportService(db).balance_distribution(by_department=True)
+        if row["department"] == "Balances"
+    ]
+    db.close()
+    assert distribution == [(-4.0, 1), (-2.0, 2), (0.0, 1), (2.0, 1)]
+
+def test_batched_leave_submission(client, monkeypatch):
+    from functools import partial
+    from app.services.leave_batcher import leave_batcher
+
+    monkeypatch.setattr(settings, "leave_batching_enabled", True)
+    monkeypatch.setattr(leave_batcher, "session_factory", partial(TestingSessionLocal, expire_on_commit=False))
+
+    with TestClient(app) as batching_client:
+        assert leave_batcher.running
+        login_response = batching_client.post("/api/v1/auth/login", json={
+            "email": settings.default_admin_email,
+            "password": settings.default_admin_password
+        })
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}", "Idempotency-Key": "batched-1"}
+        user = batching_client.get("/api/v1/employees/me", headers=headers).json()
+
+        leave_data = {"employee_id": user["id"], "start_date": "2024-08-05", "end_date": "2024-08-06", "leave_type": "personal"}
+        created = batching_client.post("/api/v1/leaves/", json=leave_data, headers=headers)
+        replay = batching_client.post("/api/v1/leaves/", json=leave_data, headers=headers)
+        overlapping = batching_client.post("/api/v1/leaves/", json=leave_data, headers={"Authorization": headers["Authorization"]})
+
+    assert not leave_batcher.running
+    assert created.status_code == 201
+    assert created.json()["days_requested"] == 2
+    assert replay.json() == created.json()
+    assert overlapping.status_code == 400
+
+def test_delta_sync(client):
+    from datetime import datetime
+    from sqlalchemy import update
+    from app.db.models.employee import Employee as EmployeeModel
+
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": settings.default_admin_email,
+        "password": settings.default_admin_password
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    full = client.get("/api/v1/sync", headers=headers).json()
+    assert [e["email"] for e in full["employees"]] == [settings.default_admin_email]
+    assert full["leave_requests"] == []
+
+    # Age the existing rows past the overlap window so only new changes come back
+    db = TestingSessionLocal()
+    db.execute(update(EmployeeModel).values(updated_at=datetime(2020, 1, 1)))
+    db.commit()
+    db.close()
+
+    employee = client.post("/api/v1/employees/", json={
+        "name": "Sync Person", "email": "sync@company.com", "department": "IT", "joining_date": "2024-01-01"
+    }, headers=headers).json()
+    client.post("/api/v1/leaves/", json={
+        "employee_id": employee["id"], "start_date": "2024-08-05", "end_date": "2024-08-06", "leave_type": "personal"
+    }, headers=headers)
+
+    delta = client.get("/api/v1/sync", params={"since": full["token"]}, headers=headers).json()
+    assert [e["email"] for e in delta["employees"]] == ["sync@company.com"]
+    assert [leave["employee_id"] for leave in delta["leave_requests"]] == [employee["id"]]
+    assert delta["token"] >= full["token"]
+
+    assert client.get("/api/v1/sync", params={"since": "yesterday"}, headers=headers).status_code == 400
+
+def test_org_snapshot_serves_authentication(client, monkeypatch):
+    from app.services.org_snapshot import org_snapshot_cache
+
+    monkeypatch.setattr(settings, "org_snapshot_enabled", True)
+    org_snapshot_cache.clear()
+    login_response = client.post("/api/v1/auth/login", json={
+        "email": settings.default_admin_email,
+        "password": settings.default_admin_password
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    employee = client.post("/api/v1/employees/", json={
+        "name": "Snapshot Person", "email": "snapshot@company.com", "department": "IT",
+        "joining_date": "2024-01-01", "password": "secret123"
+    }, headers=headers).json()
+    duplicate = client.post("/api/v1/employees/", json={
+        "name": "Snapshot Twin", "email": "snapshot@company.com", "department": "IT", "joining_date": "2024-01-01"
+    }, headers=headers)
+    assert duplicate.status_code == 400
+
+    employee_login = client.post("/api/v1/auth/login", json={"email": "snapshot@company.com", "password": "secret123"})
+    employee_headers = {"Authorization": f"Bearer {employee_login.json()['access_token']}"}
+    assert client.get("/api/v1/leaves/me", headers=employee_headers).status_code == 200
+    assert client.get("/api/v1/reports/leave-usage", params={"year": 2024}, headers=employee_headers).status_code == 403
+
+    client.delete(f"/api/v1/employees/{employee['id']}", headers=headers)
+    assert client.get("/api/v1/leaves/me", headers=employee_headers).status_code == 400
+    org_snapshot_cache.clear()
@@ -0,0 +1,66 @@
+from datetime import date
+from app.core.invalidation import InvalidationBus
+from app.services.org_snapshot import OrgSnapshot, OrgSnapshotCache
+
+JOINED = date(2024, 1, 1)
+
+
+def test_lookups_by_id_and_email():
+    snapshot = OrgSnapshot([
+        (7, "grace@company.com", "Engineering", True, False, JOINED),
+        (3, "ada@company.com", "Engineering", True, True, date(2023, 5, 2)),
+        (9, "linus@company.com", "IT", False, False, JOINED),
+    ])
+
+    ada = snapshot.get(3)
+    assert (ada.email, ada.department, ada.is_active, ada.is_admin, ada.joining_date) == (
+        "ada@company.com", "Engineering", True, True, date(2023, 5, 2)
+    )
+    assert snapshot.get_by_email("linus@company.com").id == 9
+    assert not snapshot.get_by_email("linus@company.com").is_active
+    assert snapshot.get(4) is None
+    assert snapshot.get_by_email("nobody@company.com") is None
+    assert snapshot.departments == ["Engineering", "IT"]
+
+
+def test_apply_inserts_and_overwrites_in_place():
+    snapshot = OrgSnapshot([
+        (2, "ada@company.com", "Engineering", True, False, JOINED),
+        (5, "grace@company.com", "Engineering", True, False, JOINED),
+    ])
+    snapshot.apply([
+        (5, "grace.hopper@company.com", "Navy", False, True, JOINED),
+        (9, "linus@company.com", "IT", True, False, JOINED),
+        (4, "margaret@company.com", "Apollo", True, False, JOINED),
+    ])
+
+    assert list(snapshot.ids) == [2, 4, 5, 9]
+    assert snapshot.get_by_email("grace@company.com") is None
+    grace = snapshot.get_by_email("grace.hopper@company.com")
+    assert (grace.id, grace.department, grace.is_active, grace.is_admin) == (5, "Navy", False, True)
+    assert snapshot.get(4).email == "margaret@company.com"
+    assert snapshot.get_by_email("linus@company.com").department == "IT"
+    assert snapshot.get(2).email == "ada@company.com"
+
+
+def test_cache_applies_only_changes_after_a_bump(tmp_path):
+    bus = InvalidationBus(str(tmp_path / "bus"))
+    cache = OrgSnapshotCache(3600, bus=bus)
+    rows = {1: (1, "ada@company.com", "Engineering", True, False, JOINED)}
+    calls = []
+
+    def load_rows(watermark):
+        calls.append(watermark)
+        if watermark is None:
+            return 1, list(rows.values())
+        return watermark + 1, [rows[2]]
+
+    first = cache.get(load_rows)
+    assert cache.get(load_rows) is first
+    rows[2] = (2, "grace@company.com", "Engineering", True, False, JOINED)
+    bus.bump("org_snapshot")
+
+    second = cache.get(load_rows)
+    assert calls == [None, 1]
+    assert second is not first and len(first) == 1
+    assert second.get_by_email("grace@company.com").id == 2
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.rate_limit import RateLimit, RateLimitBackend, RateLimitMiddleware
+from app.core.security import create_access_token
+
+
+class LocalBackend(RateLimitBackend):
+    """Stand-in for a shared backend that records every bucket it is asked about"""
+
+    def __init__(self, allowed: int):
+        self.allowed = allowed
+        self.calls = []
+
+    async def consume(self, key, limit, cost=1.0):
+        self.calls.append(key)
+        return 0.0 if self.calls.count(key) <= self.allowed else 2.5
+
+
+def make_app(backend, **kwargs):
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    async def items():
+        return []
+
+    @app.post("/api/v1/auth/login")
+    async def login():
+        return {}
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.2)
+        return {}
+
+    app.add_middleware(RateLimitMiddleware, backend=backend, **kwargs)
+    return app
+
+
+def test_auth_endpoints_are_limited_per_ip():
+    backend = LocalBackend(allowed=2)
+    client = TestClient(make_app(backend))
+
+    assert client.post("/api/v1/auth/login").status_code == 200
+    assert client.post("/api/v1/auth/login").status_code == 200
+    response = client.post("/api/v1/auth/login")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert "auth:testclient" in backend.calls
+
+
+def test_authenticated_reads_use_user_bucket():
+    backend = LocalBackend(allowed=100)
+    client = TestClient(make_app(backend))
+    token = create_access_token(subject="someone@company.com")
+
+    client.get("/api/v1/items", headers={"Authorization": f"Bearer {token}"})
+    assert backend.calls == ["ip:testclient", "read:someone@company.com"]
+
+
+@pytest.mark.asyncio
+async def test_sheds_load_over_concurrency_limit():
+    import httpx
+
+    backend = LocalBackend(allowed=100)
+    app = make_app(backend, max_concurrency=1)
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        responses = await asyncio.gather(client.get("/slow"), client.get("/slow"))
+    assert sorted(r.status_code for r in responses) == [200, 503]
+
+
+def test_forwarded_for_is_only_trusted_from_known_proxies():
+    middleware = RateLimitMiddleware(make_app(LocalBackend(allowed=100)), trusted_proxies=["10.0.0.0/8"])
+
+    def scope(peer, forwarded):
+        return {"client": (peer, 4321), "headers": [(b"x-forwarded-for", forwarded.encode())]}
+
+    assert middleware._client_ip(scope("10.0.0.5", "203.0.113.7, 10.0.0.9")) == "203.0.113.7"
+    assert middleware._client_ip(scope("10.0.0.5", "1.2.3.4, 203.0.113.7")) == "203.0.113.7"
+    assert middleware._client_ip(scope("198.51.100.2", "203.0.113.7")) == "198.51.100.2"
+    assert middleware._client_ip({"client": ("10.0.0.5", 4321), "headers": []}) == "10.0.0.5"
+
+
+def test_backends_must_implement_consume():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
@@ -0,0 +1,84 @@
+import json
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from app.core.logging import ContextFilter, JsonFormatter
+from app.core.request_context import RequestContextMiddleware
+from app.core.tracing import OTLPStubExporter, Tracer, instrument_engine, parse_traceparent, request_id_var, traced
+
+
+def make_app(tracer):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    instrument_engine(engine)
+
+    @traced
+    class Lookup:
+        def fetch(self):
+            with engine.connect() as connection:
+                return connection.execute(text("SELECT 1")).scalar()
+
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        return {"value": Lookup().fetch(), "request_id": request_id_var.get()}
+
+    app.add_middleware(RequestContextMiddleware, tracer=tracer)
+    return app
+
+
+def test_sampled_request_exports_service_and_sql_spans():
+    exporter = OTLPStubExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    client = TestClient(make_app(tracer))
+
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    response = client.get("/items", headers={
+        "traceparent": f"00-{trace_id}-00f067aa0ba902b7-01",
+        "X-Request-ID": "req-123"
+    })
+    tracer.shutdown()
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert response.json()["request_id"] == "req-123"
+    assert parse_traceparent(response.headers["traceparent"])[0] == trace_id
+
+    spans = exporter.payloads[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    names = [span["name"] for span in spans]
+    assert names[-1] == "GET /items"
+    assert "Lookup.fetch" in names
+    assert "db.query" in names
+    assert {span["traceId"] for span in spans} == {trace_id}
+
+
+def test_unsampled_request_records_nothing():
+    exporter = OTLPStubExporter()
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+    client = TestClient(make_app(tracer))
+
+    response = client.get("/items", headers={"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00"})
+    tracer.shutdown()
+
+    assert response.status_code == 200
+    assert len(response.headers["X-Request-ID"]) == 32
+    assert "traceparent" not in response.headers
+    assert exporter.payloads == []
+
+
+def test_json_log_lines_carry_request_id():
+    token = request_id_var.set("req-456")
+    try:
+        record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "approved %s", (7,), None)
+        record.leave_id = 7
+        ContextFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "approved 7"
+    assert entry["request_id"] == "req-456"
+    assert entry["leave_id"] == 7
+    assert "trace_id" not in entry
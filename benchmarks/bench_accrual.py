@@ -0,0 +1,60 @@
+"""Time a monthly accrual run over a synthetic employee table.
+
+    DATABASE_URL=sqlite:///./bench.db SECRET_KEY=x python benchmarks/bench_accrual.py --employees 50000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.services.accrual_service import AccrualService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="sqlite:///./bench_accrual.db")
+    parser.add_argument("--employees", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {
+                "name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "department": f"Dept {i % 40}",
+                "joining_date": date(2020, 1, 1),
+                "leave_balance": 8.0,
+                "is_active": True,
+                "is_admin": False,
+            }
+            for i in range(args.employees)
+        ])
+
+    db = Session()
+    started = time.perf_counter()
+    run = AccrualService(db, chunk_size=args.chunk_size).run_monthly_accrual("2024-01")
+    elapsed = time.perf_counter() - started
+    processed = run.processed
+    db.close()
+
+    print(f"accrual: {processed} employees in {elapsed:.2f}s ({processed / elapsed:,.0f}/s)")
+    if args.url.startswith("sqlite:///./"):
+        os.remove(args.url[len("sqlite:///"):])
+
+
+if __name__ == "__main__":
+    main()
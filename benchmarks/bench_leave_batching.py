@@ -0,0 +1,106 @@
+"""Compare one-commit-per-request leave submission with the group-commit batcher.
+
+    DATABASE_URL=sqlite:///./bench.db SECRET_KEY=x python benchmarks/bench_leave_batching.py --submissions 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveType
+from app.schemas.leave import LeaveRequestCreate
+from app.services.leave_batcher import LeaveSubmissionBatcher
+from app.services.leave_service import LeaveService
+
+
+def reset(engine, employees: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {
+                "name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "department": f"Dept {i % 40}",
+                "joining_date": date(2020, 1, 1),
+                "leave_balance": 30.0,
+                "is_active": True,
+                "is_admin": False,
+            }
+            for i in range(employees)
+        ])
+
+
+def submissions(count: int, employees: int):
+    monday = date(2024, 9, 2)
+    return [
+        LeaveRequestCreate(
+            employee_id=i % employees + 1,
+            start_date=monday + timedelta(weeks=i // employees),
+            end_date=monday + timedelta(weeks=i // employees, days=1),
+            leave_type=LeaveType.VACATION
+        )
+        for i in range(count)
+    ]
+
+
+async def submit_all(batcher, items, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(item):
+        async with semaphore:
+            await batcher.submit(item)
+
+    batcher.start()
+    try:
+        await asyncio.gather(*(one(item) for item in items))
+    finally:
+        await batcher.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="sqlite:///./bench_leave_batching.db")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--submissions", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Session = sessionmaker(bind=engine)
+    items = submissions(args.submissions, args.employees)
+
+    reset(engine, args.employees)
+    db = Session()
+    started = time.perf_counter()
+    for item in items:
+        LeaveService(db).create_leave_request(item)
+    single = time.perf_counter() - started
+    db.close()
+    print(f"one commit per request: {args.submissions / single:8,.0f} submissions/s")
+
+    reset(engine, args.employees)
+    batcher = LeaveSubmissionBatcher(partial(Session, expire_on_commit=False))
+    started = time.perf_counter()
+    asyncio.run(submit_all(batcher, items, args.concurrency))
+    batched = time.perf_counter() - started
+    print(f"group commit:           {args.submissions / batched:8,.0f} submissions/s "
+          f"({batcher.batches} batches, {single / batched:.1f}x)")
+
+    engine.dispose()
+    if args.url.startswith("sqlite:///./"):
+        os.remove(args.url[len("sqlite:///"):])
+
+
+if __name__ == "__main__":
+    main()
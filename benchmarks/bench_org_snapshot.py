@@ -0,0 +1,87 @@
+"""Measure the memory and lookup cost of the org snapshot against ORM Employee objects.
+
+    DATABASE_URL=sqlite:///./bench.db SECRET_KEY=x python benchmarks/bench_org_snapshot.py --employees 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.services.employee_service import EmployeeService, ORG_SNAPSHOT_ROWS
+from app.services.org_snapshot import OrgSnapshot
+
+
+def retained(build):
+    """Result of build() and the memory it still holds"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def per_call(fn, calls):
+    start = time.perf_counter()
+    for n in range(calls):
+        fn(n)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--departments", type=int, default=40)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {
+                "name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "department": f"Department {i % args.departments}",
+                "joining_date": date(2020, 1, 1),
+                "leave_balance": 30.0,
+            }
+            for i in range(args.employees)
+        ])
+    db = sessionmaker(bind=engine)()
+    rows = db.execute(ORG_SNAPSHOT_ROWS).all()
+
+    snapshot, snapshot_bytes = retained(lambda: OrgSnapshot(rows))
+    employees, orm_bytes = retained(lambda: db.query(Employee).all())
+    print(f"{args.employees:,} employees")
+    print(f"  OrgSnapshot     {snapshot_bytes / 2**20:8.1f} MB  ({snapshot.nbytes / 2**20:.1f} MB in arrays)")
+    print(f"  ORM Employee    {orm_bytes / 2**20:8.1f} MB")
+
+    ids = len(rows)
+    service = EmployeeService(db)
+    print(f"{'lookup':<16} {'us/call':>8}")
+    print(f"{'snapshot id':<16} {per_call(lambda n: snapshot.get(rows[n % ids].id), args.calls):8.2f}")
+    print(f"{'snapshot email':<16} {per_call(lambda n: snapshot.get_by_email(rows[n % ids].email), args.calls):8.2f}")
+    del employees
+    db.expunge_all()
+    print(f"{'ORM email':<16} {per_call(lambda n: service.get_employee_by_email(rows[n % ids].email), args.calls):8.2f}")
+
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
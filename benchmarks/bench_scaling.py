@@ -0,0 +1,153 @@
+"""Measure throughput of the existing read endpoints under gunicorn with 1 to N workers.
+
+    python benchmarks/bench_scaling.py --max-workers 4 --duration 10
+
+Each run starts gunicorn with gunicorn.conf.py and WEB_CONCURRENCY set, waits for /readyz,
+then drives it with client processes (so the load generator is not limited by one GIL).
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ADMIN_EMAIL = "admin@company.com"
+ADMIN_PASSWORD = "admin123"
+PATHS = ["/api/v1/employees/", "/api/v1/leaves/", "/api/v1/employees/me", "/health"]
+
+
+def seed(url: str, employees: int) -> None:
+    from sqlalchemy import create_engine, insert
+    from app.db.base import Base
+    from app.db.models.employee import Employee
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {
+                "name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "department": f"Dept {i % 40}",
+                "joining_date": date(2020, 1, 1),
+                "leave_balance": 30.0,
+                "is_active": True,
+                "is_admin": False,
+            }
+            for i in range(employees)
+        ])
+    engine.dispose()
+
+
+def request(conn, method: str, path: str, body=None, headers=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def wait_ready(port: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            status, _ = request(conn, "GET", "/readyz")
+            conn.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+
+def client(port: int, token: str, duration: float, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    headers = {"Authorization": f"Bearer {token}"}
+    done = errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        status, _ = request(conn, "GET", PATHS[done % len(PATHS)], headers=headers)
+        done += 1
+        errors += status != 200
+    conn.close()
+    results.put((done, errors))
+
+
+def run(workers: int, args, env) -> float:
+    env = {**env, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{args.port}"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_ready(args.port)
+        conn = http.client.HTTPConnection("127.0.0.1", args.port)
+        _, body = request(conn, "POST", "/api/v1/auth/login",
+                          body=json.dumps({"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}),
+                          headers={"Content-Type": "application/json"})
+        conn.close()
+        token = json.loads(body)["access_token"]
+
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=client, args=(args.port, token, args.duration, results))
+            for _ in range(args.clients)
+        ]
+        for process in clients:
+            process.start()
+        totals = [results.get() for _ in clients]
+        for process in clients:
+            process.join()
+        done = sum(count for count, _ in totals)
+        errors = sum(failed for _, failed in totals)
+        if errors:
+            print(f"  {errors} non-200 responses")
+        return done / args.duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=f"sqlite:///{os.path.join(ROOT, 'bench_scaling.db')}")
+    parser.add_argument("--max-workers", type=int, default=len(os.sched_getaffinity(0)))
+    parser.add_argument("--clients", type=int, default=0, help="client processes (default 2 per worker)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.url
+    os.environ.setdefault("SECRET_KEY", "bench")
+    seed(args.url, args.employees)
+    env = {
+        **os.environ,
+        "DEFAULT_ADMIN_EMAIL": ADMIN_EMAIL,
+        "DEFAULT_ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "RATE_LIMIT_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+
+    baseline = None
+    fixed_clients = args.clients
+    for workers in range(1, args.max_workers + 1):
+        args.clients = fixed_clients or 2 * workers
+        throughput = run(workers, args, env)
+        baseline = baseline or throughput
+        print(f"{workers} worker(s), {args.clients} clients: {throughput:8,.0f} req/s ({throughput / baseline:.2f}x)")
+
+    if args.url.startswith("sqlite:///"):
+        os.remove(args.url[len("sqlite:///"):])
+
+
+if __name__ == "__main__":
+    main()
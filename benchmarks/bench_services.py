@@ -0,0 +1,140 @@
+"""Compare per-call CPU of the hot service lookups against the legacy db.query versions.
+
+    DATABASE_URL=sqlite:///./bench.db SECRET_KEY=x python benchmarks/bench_services.py --calls 5000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.employee import Employee
+from app.db.models.leave import LeaveRequest, LeaveStatus, LeaveType
+from app.services.employee_service import EmployeeService
+from app.services.leave_service import LeaveService
+
+
+def legacy_get_employee(db, employee_id):
+    return db.query(Employee).filter(Employee.id == employee_id).first()
+
+
+def legacy_get_employee_by_email(db, email):
+    return db.query(Employee).filter(Employee.email == email).first()
+
+
+def legacy_get_leave_request(db, leave_id):
+    return db.query(LeaveRequest).filter(LeaveRequest.id == leave_id).first()
+
+
+def legacy_check_overlapping_leaves(db, employee_id, start_date, end_date):
+    return db.query(LeaveRequest).filter(
+        and_(
+            LeaveRequest.employee_id == employee_id,
+            LeaveRequest.status.in_([LeaveStatus.PENDING, LeaveStatus.APPROVED]),
+            or_(
+                and_(LeaveRequest.start_date <= start_date, LeaveRequest.end_date >= start_date),
+                and_(LeaveRequest.start_date <= end_date, LeaveRequest.end_date >= end_date),
+                and_(LeaveRequest.start_date >= start_date, LeaveRequest.end_date <= end_date)
+            )
+        )
+    ).first() is not None
+
+
+def seed(engine, employees: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {
+                "name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "department": f"Dept {i % 40}",
+                "joining_date": date(2020, 1, 1),
+                "leave_balance": 30.0,
+                "is_active": True,
+                "is_admin": False,
+            }
+            for i in range(employees)
+        ])
+        conn.execute(insert(LeaveRequest), [
+            {
+                "employee_id": i + 1,
+                "start_date": date(2024, 9, 2),
+                "end_date": date(2024, 9, 3),
+                "leave_type": LeaveType.VACATION,
+                "days_requested": 2,
+                "status": LeaveStatus.PENDING,
+            }
+            for i in range(employees)
+        ])
+
+
+def timed(call, calls: int, rounds: int) -> float:
+    """Best-of-rounds microseconds per call"""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for n in range(calls):
+            call(n)
+        best = min(best, (time.perf_counter() - started) / calls * 1e6)
+    return best
+
+
+def report(cases, calls: int, rounds: int) -> None:
+    for name, legacy, current in cases:
+        before = timed(legacy, calls, rounds)
+        after = timed(current, calls, rounds)
+        print(f"{name:<26} {before:8.1f}us {after:8.1f}us ({(after / before - 1) * 100:+.0f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    seed(engine, args.employees)
+    db = sessionmaker(bind=engine)()
+    employees = EmployeeService(db)
+    leaves = LeaveService(db)
+    ids = args.employees
+    start, end = date(2024, 9, 3), date(2024, 9, 4)
+
+    cases = [
+        ("get_employee",
+         lambda n: legacy_get_employee(db, n % ids + 1),
+         lambda n: employees.get_employee(n % ids + 1)),
+        ("get_employee_by_email",
+         lambda n: legacy_get_employee_by_email(db, f"employee{n % ids}@example.com"),
+         lambda n: employees.get_employee_by_email(f"employee{n % ids}@example.com")),
+        ("get_leave_request",
+         lambda n: legacy_get_leave_request(db, n % ids + 1),
+         lambda n: leaves.get_leave_request(n % ids + 1)),
+        ("_check_overlapping_leaves",
+         lambda n: legacy_check_overlapping_leaves(db, n % ids + 1, start, end),
+         lambda n: leaves._check_overlapping_leaves(n % ids + 1, start, end)),
+    ]
+
+    print(f"{'method':<26} {'db.query':>10} {'select()':>10}")
+    report(cases, args.calls, args.rounds)
+
+    # The identity map only holds weak references, so the cases above miss it; a request that
+    # already loaded the employee (the current user, say) finds it there without a query
+    loaded = db.query(Employee).all()
+    report([("get_employee (loaded)",) + cases[0][1:]], args.calls, args.rounds)
+
+    del loaded
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
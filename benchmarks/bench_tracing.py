@@ -0,0 +1,96 @@
+"""Compare request latency with and without the request-context middleware at several sample rates.
+
+    DATABASE_URL=sqlite:///./bench.db SECRET_KEY=x python benchmarks/bench_tracing.py --requests 3000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.request_context import RequestContextMiddleware
+from app.core.tracing import OTLPStubExporter, Tracer, instrument_engine, traced
+
+
+def make_app(tracer):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    if tracer is not None:
+        instrument_engine(engine)
+
+    class Lookup:
+        def fetch(self):
+            with engine.connect() as connection:
+                return connection.execute(text("SELECT 1")).scalar()
+
+    if tracer is not None:
+        Lookup = traced(Lookup)
+
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        return {"value": Lookup().fetch()}
+
+    if tracer is not None:
+        app.add_middleware(RequestContextMiddleware, tracer=tracer)
+    return app
+
+
+async def _drive(app, requests: int) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/items", "raw_path": b"/items", "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80)
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+
+
+def timed(app, requests: int) -> float:
+    """Microseconds per request, driving the ASGI app directly so no HTTP client cost is included"""
+    asyncio.run(_drive(app, 200))
+    started = time.perf_counter()
+    asyncio.run(_drive(app, requests))
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    configs = [("no middleware", None)] + [
+        (f"sample rate {rate}", Tracer(sample_rate=rate, exporter=OTLPStubExporter())) for rate in (0.0, 0.01, 1.0)
+    ]
+    apps = [(label, make_app(tracer)) for label, tracer in configs]
+
+    # Interleave rounds and keep the best of each so scheduler noise does not favour one config
+    best = {label: float("inf") for label, _ in apps}
+    for _ in range(args.rounds):
+        for label, app in apps:
+            best[label] = min(best[label], timed(app, args.requests))
+
+    baseline = best["no middleware"]
+    for label, _ in apps:
+        print(f"{label:<17}: {best[label]:8.1f} us/request ({(best[label] / baseline - 1) * 100:+.1f}%)")
+    for _, tracer in configs:
+        if tracer is not None:
+            tracer.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Gunicorn settings for running one Uvicorn worker per core.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+WEB_CONCURRENCY overrides the worker count, MAX_REQUESTS / MAX_REQUESTS_JITTER the recycling.
+"""
+import os
+import tempfile
+
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# Async workers do not block on I/O, so one per core the container may actually use
+workers = int(os.environ.get("WEB_CONCURRENCY", 0)) or len(os.sched_getaffinity(0))
+
+# Recycle workers to bound memory growth; the jitter keeps them from restarting together
+max_requests = int(os.environ.get("MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", 1000))
+
+# Longer than SHUTDOWN_DRAIN_SECONDS so a draining worker is not killed mid-request
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.environ.get("WORKER_TIMEOUT", 60))
+keepalive = 5
+
+
+def on_starting(server):
+    # Created before the workers fork so they all map the same cache generation counters
+    if not os.environ.get("INVALIDATION_BUS_PATH"):
+        path = os.path.join(tempfile.gettempdir(), f"leave-management-invalidation-{os.getpid()}")
+        os.environ["INVALIDATION_BUS_PATH"] = path
+        server.log.info("Cache invalidation bus at %s", path)
+
+
+def on_exit(server):
+    path = os.environ.get("INVALIDATION_BUS_PATH", "")
+    if path.startswith(os.path.join(tempfile.gettempdir(), "leave-management-invalidation-")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass